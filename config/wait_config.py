@@ -3,6 +3,8 @@ TestZen Wait Configuration
 Configure wait times and timeouts for different scenarios to prevent flaky tests
 """
 
+import os
+
 # WebView Configuration
 WEBVIEW_WAIT_CONFIG = {
     # Maximum time to wait for WebView context to appear (seconds)
@@ -74,31 +76,55 @@ ACTION_WAIT_CONFIG = {
     'post_screenshot_wait': 0.5,
 }
 
+# Environment variables that indicate a CI/CD run
+_CI_INDICATORS = (
+    'CI', 'CONTINUOUS_INTEGRATION',
+    'GITHUB_ACTIONS', 'GITLAB_CI', 'JENKINS_HOME',
+    'TRAVIS', 'CIRCLECI', 'BITBUCKET_BUILD_NUMBER'
+)
+
+def _detect_ci_environment():
+    env = os.environ
+    return any(env.get(key) for key in _CI_INDICATORS)
+
+# CI environment variables do not change mid-process, so detect once at import
+_IS_CI = _detect_ci_environment()
+_AUTO_DETECT_CI = CI_CONFIG['auto_detect_ci']
+_CI_WAIT_MULTIPLIER = float(CI_CONFIG['ci_wait_multiplier'])
+
 def is_ci_environment():
     """Detect if running in CI/CD environment"""
-    import os
-    ci_indicators = [
-        'CI', 'CONTINUOUS_INTEGRATION',
-        'GITHUB_ACTIONS', 'GITLAB_CI', 'JENKINS_HOME',
-        'TRAVIS', 'CIRCLECI', 'BITBUCKET_BUILD_NUMBER'
-    ]
-    return any(os.getenv(key) for key in ci_indicators)
-
-def get_wait_timeout(config_key, timeout_value):
-    """Get timeout value with CI multiplier if applicable"""
-    if CI_CONFIG['auto_detect_ci'] and is_ci_environment():
-        return int(timeout_value * CI_CONFIG['ci_wait_multiplier'])
-    return timeout_value
+    return _IS_CI
+
+# Partially evaluate the CI adjustment: outside CI timeouts pass through unchanged
+_CI_ADJUST = _AUTO_DETECT_CI and _IS_CI
+_EFFECTIVE_MULTIPLIER = _CI_WAIT_MULTIPLIER if _CI_ADJUST else 1
+
+if _CI_ADJUST:
+    def get_wait_timeout(config_key, timeout_value):
+        """Get timeout value with CI multiplier if applicable"""
+        return int(timeout_value * _EFFECTIVE_MULTIPLIER)
+else:
+    def get_wait_timeout(config_key, timeout_value):
+        """Get timeout value with CI multiplier if applicable"""
+        return timeout_value
+
+# Indexed by bool(is_optional): (default, optional) element timeouts
+_ELEMENT_TIMEOUTS = (
+    get_wait_timeout('element', ELEMENT_WAIT_CONFIG['default_timeout']),
+    get_wait_timeout('element', ELEMENT_WAIT_CONFIG['optional_element_timeout']),
+)
+_WEBVIEW_TIMEOUT = get_wait_timeout('webview', WEBVIEW_WAIT_CONFIG['webview_content_timeout'])
+_APP_LAUNCH_WAIT = get_wait_timeout('launch', APP_LAUNCH_CONFIG['post_launch_wait'])
 
 def get_webview_timeout():
     """Get WebView wait timeout with CI adjustment"""
-    return get_wait_timeout('webview', WEBVIEW_WAIT_CONFIG['webview_content_timeout'])
+    return _WEBVIEW_TIMEOUT
 
 def get_element_timeout(is_optional=False):
     """Get element finding timeout with CI adjustment"""
-    timeout = ELEMENT_WAIT_CONFIG['optional_element_timeout'] if is_optional else ELEMENT_WAIT_CONFIG['default_timeout']
-    return get_wait_timeout('element', timeout)
+    return _ELEMENT_TIMEOUTS[bool(is_optional)]
 
 def get_app_launch_wait():
     """Get app launch wait time with CI adjustment"""
-    return get_wait_timeout('launch', APP_LAUNCH_CONFIG['post_launch_wait'])
+    return _APP_LAUNCH_WAIT
@@ -4,14 +4,25 @@ CI/CD Pipeline Integration for TestZen Framework
 Supports Jenkins, GitHub Actions, GitLab CI, Azure DevOps, and more
 """
 
+import io
 import os
 import json
-import yaml
-import subprocess
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, TextIO
 from pathlib import Path
 import logging
 from enum import Enum
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent JIRA issue-link requests
+_JIRA_LINK_WORKERS = 16
+
+# Seconds to wait on the GitHub REST API before giving up on a PR comment
+_GITHUB_API_TIMEOUT = 30
 
 class CIPlatform(Enum):
     JENKINS = "jenkins"
@@ -22,31 +33,80 @@ class CIPlatform(Enum):
     BAMBOO = "bamboo"
     TEAMCITY = "teamcity"
 
+# Environment variable that identifies each platform, in detection priority order
+_CI_ENV_MAP = (
+    ('JENKINS_URL', CIPlatform.JENKINS),
+    ('GITHUB_ACTIONS', CIPlatform.GITHUB_ACTIONS),
+    ('GITLAB_CI', CIPlatform.GITLAB_CI),
+    ('TF_BUILD', CIPlatform.AZURE_DEVOPS),
+    ('CIRCLECI', CIPlatform.CIRCLECI),
+    ('bamboo_buildKey', CIPlatform.BAMBOO),
+    ('TEAMCITY_VERSION', CIPlatform.TEAMCITY),
+)
+
+@lru_cache(maxsize=1)
+def _detect_platform() -> Optional[CIPlatform]:
+    """Detect which CI/CD platform is running (cached, env is fixed per process)"""
+    env = os.environ
+    return next((platform for env_key, platform in _CI_ENV_MAP if env.get(env_key)), None)
+
+def _jenkins_build_info() -> Dict[str, Any]:
+    return {
+        'build_id': os.environ.get('BUILD_ID', ''),
+        'build_url': os.environ.get('BUILD_URL', ''),
+        'branch': os.environ.get('BRANCH_NAME', ''),
+        'commit': os.environ.get('GIT_COMMIT', ''),
+        'triggered_by': os.environ.get('BUILD_USER', ''),
+        'workspace': os.environ.get('WORKSPACE', '')
+    }
+
+def _github_actions_build_info() -> Dict[str, Any]:
+    return {
+        'build_id': os.environ.get('GITHUB_RUN_ID', ''),
+        'build_url': f"https://github.com/{os.environ.get('GITHUB_REPOSITORY')}/actions/runs/{os.environ.get('GITHUB_RUN_ID')}",
+        'branch': os.environ.get('GITHUB_REF_NAME', ''),
+        'commit': os.environ.get('GITHUB_SHA', ''),
+        'triggered_by': os.environ.get('GITHUB_ACTOR', ''),
+        'workspace': os.environ.get('GITHUB_WORKSPACE', '')
+    }
+
+def _gitlab_ci_build_info() -> Dict[str, Any]:
+    return {
+        'build_id': os.environ.get('CI_PIPELINE_ID', ''),
+        'build_url': os.environ.get('CI_PIPELINE_URL', ''),
+        'branch': os.environ.get('CI_COMMIT_REF_NAME', ''),
+        'commit': os.environ.get('CI_COMMIT_SHA', ''),
+        'triggered_by': os.environ.get('GITLAB_USER_LOGIN', ''),
+        'workspace': os.environ.get('CI_PROJECT_DIR', '')
+    }
+
+# Platform-specific build info builders; other platforms report the local defaults
+_INFO_BUILDERS = {
+    CIPlatform.JENKINS: _jenkins_build_info,
+    CIPlatform.GITHUB_ACTIONS: _github_actions_build_info,
+    CIPlatform.GITLAB_CI: _gitlab_ci_build_info,
+}
+
+@lru_cache(maxsize=None)
+def _platform_build_info(platform: Optional[CIPlatform]) -> Mapping[str, Any]:
+    """CI environment values for a platform, read once since they are fixed for the run"""
+    builder = _INFO_BUILDERS.get(platform)
+    return MappingProxyType(builder() if builder else {})
+
+# Attribute escapes matching ElementTree's serializer output
+_XML_ATTR_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#09;'}
+
+def _xml_attr(value: Any) -> str:
+    """Escape a value as a double-quoted XML attribute"""
+    return f'"{escape(str(value), _XML_ATTR_ENTITIES)}"'
+
 class PipelineIntegrator:
     """Main CI/CD pipeline integration class"""
 
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        self.platform = self._detect_platform()
+        self.platform = _detect_platform()
         self.environment_vars = {}
-
-    def _detect_platform(self) -> Optional[CIPlatform]:
-        """Detect which CI/CD platform is running"""
-        if os.environ.get('JENKINS_URL'):
-            return CIPlatform.JENKINS
-        elif os.environ.get('GITHUB_ACTIONS'):
-            return CIPlatform.GITHUB_ACTIONS
-        elif os.environ.get('GITLAB_CI'):
-            return CIPlatform.GITLAB_CI
-        elif os.environ.get('TF_BUILD'):
-            return CIPlatform.AZURE_DEVOPS
-        elif os.environ.get('CIRCLECI'):
-            return CIPlatform.CIRCLECI
-        elif os.environ.get('bamboo_buildKey'):
-            return CIPlatform.BAMBOO
-        elif os.environ.get('TEAMCITY_VERSION'):
-            return CIPlatform.TEAMCITY
-        return None
+        self._gh_session = None
 
     def get_build_info(self) -> Dict[str, Any]:
         """Get build information from CI environment"""
@@ -59,35 +119,7 @@ class PipelineIntegrator:
             'triggered_by': '',
             'workspace': os.getcwd()
         }
-
-        if self.platform == CIPlatform.JENKINS:
-            info.update({
-                'build_id': os.environ.get('BUILD_ID', ''),
-                'build_url': os.environ.get('BUILD_URL', ''),
-                'branch': os.environ.get('BRANCH_NAME', ''),
-                'commit': os.environ.get('GIT_COMMIT', ''),
-                'triggered_by': os.environ.get('BUILD_USER', ''),
-                'workspace': os.environ.get('WORKSPACE', '')
-            })
-        elif self.platform == CIPlatform.GITHUB_ACTIONS:
-            info.update({
-                'build_id': os.environ.get('GITHUB_RUN_ID', ''),
-                'build_url': f"https://github.com/{os.environ.get('GITHUB_REPOSITORY')}/actions/runs/{os.environ.get('GITHUB_RUN_ID')}",
-                'branch': os.environ.get('GITHUB_REF_NAME', ''),
-                'commit': os.environ.get('GITHUB_SHA', ''),
-                'triggered_by': os.environ.get('GITHUB_ACTOR', ''),
-                'workspace': os.environ.get('GITHUB_WORKSPACE', '')
-            })
-        elif self.platform == CIPlatform.GITLAB_CI:
-            info.update({
-                'build_id': os.environ.get('CI_PIPELINE_ID', ''),
-                'build_url': os.environ.get('CI_PIPELINE_URL', ''),
-                'branch': os.environ.get('CI_COMMIT_REF_NAME', ''),
-                'commit': os.environ.get('CI_COMMIT_SHA', ''),
-                'triggered_by': os.environ.get('GITLAB_USER_LOGIN', ''),
-                'workspace': os.environ.get('CI_PROJECT_DIR', '')
-            })
-
+        info.update(_platform_build_info(self.platform))
         return info
 
     def publish_test_results(self, results: Dict[str, Any], format: str = 'junit'):
@@ -101,11 +133,10 @@ class PipelineIntegrator:
 
     def _publish_junit_results(self, results: Dict[str, Any]):
         """Publish JUnit format results"""
-        junit_xml = self._generate_junit_xml(results)
         output_path = 'test-results.xml'
 
         with open(output_path, 'w') as f:
-            f.write(junit_xml)
+            self._write_junit_xml(results, f)
 
         # Platform-specific publishing
         if self.platform == CIPlatform.JENKINS:
@@ -113,35 +144,37 @@ class PipelineIntegrator:
         elif self.platform == CIPlatform.GITHUB_ACTIONS:
             print(f"::set-output name=test-results::{output_path}")
 
-        self.logger.info(f"JUnit results published to {output_path}")
+        logger.info("JUnit results published to %s", output_path)
 
     def _generate_junit_xml(self, results: Dict[str, Any]) -> str:
         """Generate JUnit XML from test results"""
-        from xml.etree.ElementTree import Element, SubElement, tostring
+        buffer = io.StringIO()
+        self._write_junit_xml(results, buffer)
+        return buffer.getvalue()
 
-        testsuites = Element('testsuites')
-        testsuites.set('name', 'TestZen Automation')
-        testsuites.set('tests', str(results.get('total_steps', 0)))
-        testsuites.set('failures', str(results.get('failed_steps', 0)))
+    def _write_junit_xml(self, results: Dict[str, Any], fh: TextIO):
+        """Stream JUnit XML for test results to an open text file handle"""
+        total = results.get('total_steps', 0)
+        failures = results.get('failed_steps', 0)
 
-        testsuite = SubElement(testsuites, 'testsuite')
-        testsuite.set('name', results.get('test_file', 'Unknown'))
-        testsuite.set('tests', str(results.get('total_steps', 0)))
-        testsuite.set('failures', str(results.get('failed_steps', 0)))
-        testsuite.set('time', str(results.get('duration', 0)))
+        fh.write(f'<testsuites name="TestZen Automation" tests={_xml_attr(total)} failures={_xml_attr(failures)}>')
+        fh.write(
+            f'<testsuite name={_xml_attr(results.get("test_file", "Unknown"))} tests={_xml_attr(total)} '
+            f'failures={_xml_attr(failures)} time={_xml_attr(results.get("duration", 0))}>'
+        )
 
         for step in results.get('steps', []):
-            testcase = SubElement(testsuite, 'testcase')
-            testcase.set('name', f"Step {step.get('step_no', '')} - {step.get('action', '')}")
-            testcase.set('classname', 'TestZen')
-            testcase.set('time', str(step.get('duration', 0)))
-
+            name = f"Step {step.get('step_no', '')} - {step.get('action', '')}"
+            testcase = f'<testcase name={_xml_attr(name)} classname="TestZen" time={_xml_attr(step.get("duration", 0))}'
             if step.get('status') == 'failed':
-                failure = SubElement(testcase, 'failure')
-                failure.set('message', step.get('message', 'Test failed'))
-                failure.text = step.get('error', '')
+                failure = f'<failure message={_xml_attr(step.get("message", "Test failed"))}'
+                error = step.get('error', '')
+                failure = f'{failure}>{escape(error)}</failure>' if error else f'{failure} />'
+                fh.write(f'{testcase}>{failure}</testcase>')
+            else:
+                fh.write(f'{testcase} />')
 
-        return tostring(testsuites, encoding='unicode')
+        fh.write('</testsuite></testsuites>')
 
     def set_environment_variable(self, name: str, value: str):
         """Set environment variable for current and future steps"""
@@ -153,17 +186,58 @@ class PipelineIntegrator:
         elif self.platform == CIPlatform.AZURE_DEVOPS:
             print(f"##vso[task.setvariable variable={name}]{value}")
 
+    def _get_github_session(self, token: str):
+        """Return a keep-alive session for the GitHub REST API, created on first use;
+        None when requests is not installed"""
+        if self._gh_session is None:
+            try:
+                import requests
+            except ImportError:
+                return None
+
+            self._gh_session = requests.Session()
+            self._gh_session.headers.update({
+                'Authorization': f"Bearer {token}",
+                'Accept': 'application/vnd.github+json'
+            })
+        return self._gh_session
+
     def add_comment_to_pr(self, comment: str):
         """Add comment to pull request"""
         if self.platform == CIPlatform.GITHUB_ACTIONS:
             pr_number = os.environ.get('GITHUB_REF').split('/')[-2]
             repo = os.environ.get('GITHUB_REPOSITORY')
+            token = os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
 
-            subprocess.run([
-                'gh', 'pr', 'comment', pr_number,
-                '--repo', repo,
-                '--body', comment
-            ])
+            session = self._get_github_session(token) if token else None
+
+            if session is not None:
+                api_url = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+                try:
+                    response = session.post(
+                        f"{api_url}/repos/{repo}/issues/{pr_number}/comments",
+                        json={'body': comment},
+                        timeout=_GITHUB_API_TIMEOUT
+                    )
+                    response.raise_for_status()
+                except Exception as e:
+                    logger.error("Failed to comment on PR #%s: %s", pr_number, e)
+                    return False
+                return True
+
+            # No API token or no requests package: fall back to the gh CLI
+            import subprocess
+
+            try:
+                subprocess.run([
+                    'gh', 'pr', 'comment', pr_number,
+                    '--repo', repo,
+                    '--body', comment
+                ], check=True)
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.error("Failed to comment on PR #%s via gh: %s", pr_number, e)
+                return False
+            return True
 
     def upload_artifacts(self, paths: List[str], artifact_name: str = 'test-artifacts'):
         """Upload artifacts to CI platform"""
@@ -175,14 +249,11 @@ class PipelineIntegrator:
                 print(f"Archiving artifact: {path}")
         elif self.platform == CIPlatform.GITLAB_CI:
             # GitLab CI artifacts are configured in .gitlab-ci.yml
-            self.logger.info(f"Artifacts configured in .gitlab-ci.yml: {paths}")
+            logger.info("Artifacts configured in .gitlab-ci.yml: %s", paths)
 
 class JenkinsIntegration:
     """Jenkins-specific integration"""
 
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-
     def generate_jenkinsfile(self, config: Dict[str, Any]) -> str:
         """Generate Jenkinsfile for TestZen automation"""
         jenkinsfile = """pipeline {
@@ -257,95 +328,81 @@ class JenkinsIntegration:
 }"""
         return jenkinsfile
 
+# Static GitHub Actions workflow; emitted verbatim instead of building and dumping a dict
+_WORKFLOW_TEMPLATE = """jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+    - name: Checkout code
+      uses: actions/checkout@v2
+    - name: Setup Python
+      uses: actions/setup-python@v2
+      with:
+        python-version: '3.9'
+    - name: Install dependencies
+      run: pip install -r requirements.txt
+    - name: Setup Appium
+      run: npm install -g appium
+    - name: Start Appium
+      run: appium &
+    - name: Run TestZen Tests
+      run: ./testzen run --all --platform ${{ matrix.platform }}
+    - if: always()
+      name: Upload Test Results
+      uses: actions/upload-artifact@v2
+      with:
+        name: test-results-${{ matrix.platform }}
+        path: reports/
+    - if: always()
+      name: Publish Test Report
+      uses: dorny/test-reporter@v1
+      with:
+        name: TestZen Report - ${{ matrix.platform }}
+        path: reports/**/*.xml
+        reporter: java-junit
+    strategy:
+      matrix:
+        platform:
+        - android
+        - ios
+name: TestZen Automation
+'on':
+  pull_request:
+    branches:
+    - main
+  push:
+    branches:
+    - main
+    - develop
+  schedule:
+  - cron: 0 0 * * *
+"""
+
 class GitHubActionsIntegration:
     """GitHub Actions specific integration"""
 
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-
     def generate_workflow(self, config: Dict[str, Any]) -> str:
         """Generate GitHub Actions workflow for TestZen"""
-        workflow = {
-            'name': 'TestZen Automation',
-            'on': {
-                'push': {
-                    'branches': ['main', 'develop']
-                },
-                'pull_request': {
-                    'branches': ['main']
-                },
-                'schedule': [
-                    {'cron': '0 0 * * *'}  # Daily at midnight
-                ]
-            },
-            'jobs': {
-                'test': {
-                    'runs-on': 'ubuntu-latest',
-                    'strategy': {
-                        'matrix': {
-                            'platform': ['android', 'ios']
-                        }
-                    },
-                    'steps': [
-                        {
-                            'name': 'Checkout code',
-                            'uses': 'actions/checkout@v2'
-                        },
-                        {
-                            'name': 'Setup Python',
-                            'uses': 'actions/setup-python@v2',
-                            'with': {
-                                'python-version': '3.9'
-                            }
-                        },
-                        {
-                            'name': 'Install dependencies',
-                            'run': 'pip install -r requirements.txt'
-                        },
-                        {
-                            'name': 'Setup Appium',
-                            'run': 'npm install -g appium'
-                        },
-                        {
-                            'name': 'Start Appium',
-                            'run': 'appium &'
-                        },
-                        {
-                            'name': 'Run TestZen Tests',
-                            'run': f"./testzen run --all --platform ${{{{ matrix.platform }}}}"
-                        },
-                        {
-                            'name': 'Upload Test Results',
-                            'uses': 'actions/upload-artifact@v2',
-                            'if': 'always()',
-                            'with': {
-                                'name': 'test-results-${{ matrix.platform }}',
-                                'path': 'reports/'
-                            }
-                        },
-                        {
-                            'name': 'Publish Test Report',
-                            'uses': 'dorny/test-reporter@v1',
-                            'if': 'always()',
-                            'with': {
-                                'name': 'TestZen Report - ${{ matrix.platform }}',
-                                'path': 'reports/**/*.xml',
-                                'reporter': 'java-junit'
-                            }
-                        }
-                    ]
-                }
-            }
-        }
+        return _WORKFLOW_TEMPLATE
+
+_JIRA_HEADER_TMPL = """
+h2. Test Execution Summary
 
-        return yaml.dump(workflow, default_flow_style=False)
+*Test File:* {test_file}
+*Status:* {status}
+*Total Steps:* {total_steps}
+*Passed:* {passed_steps}
+*Failed:* {failed_steps}
+*Duration:* {duration}s
+
+h3. Step Details
+
+||Step||Action||Status||Duration||
+"""
 
 class TestManagementIntegration:
     """Integration with Test Management Systems"""
 
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-
     def sync_with_jira(self, config: Dict[str, Any], results: Dict[str, Any]):
         """Sync test results with JIRA"""
         from jira import JIRA
@@ -365,19 +422,29 @@ class TestManagementIntegration:
             }
 
             issue = jira.create_issue(fields=issue_dict)
-            self.logger.info(f"JIRA issue created: {issue.key}")
-
-            # Link to test cases
-            for step in results.get('steps', []):
-                if step.get('test_case_id'):
-                    jira.create_issue_link(
-                        type='Tests',
-                        inwardIssue=issue.key,
-                        outwardIssue=step['test_case_id']
-                    )
+            logger.info("JIRA issue created: %s", issue.key)
+
+            # Link to test cases; each link is an independent HTTP round trip
+            test_case_ids = [step['test_case_id'] for step in results.get('steps', []) if step.get('test_case_id')]
+            if test_case_ids:
+                with ThreadPoolExecutor(max_workers=min(_JIRA_LINK_WORKERS, len(test_case_ids))) as executor:
+                    futures = {
+                        executor.submit(
+                            jira.create_issue_link,
+                            type='Tests',
+                            inwardIssue=issue.key,
+                            outwardIssue=test_case_id
+                        ): test_case_id
+                        for test_case_id in test_case_ids
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            logger.error("JIRA link to %s failed: %s", futures[future], e)
 
         except Exception as e:
-            self.logger.error(f"JIRA sync failed: {e}")
+            logger.error("JIRA sync failed: %s", e)
 
     def sync_with_testrail(self, config: Dict[str, Any], results: Dict[str, Any]):
         """Sync test results with TestRail"""
@@ -385,61 +452,63 @@ class TestManagementIntegration:
 
         try:
             base_url = config['testrail_url']
-            auth = (config['testrail_user'], config['testrail_password'])
-
-            # Create test run
-            run_data = {
-                'suite_id': config['suite_id'],
-                'name': f"TestZen Run - {results['test_file']}",
-                'description': f"Automated run from TestZen",
-                'include_all': True
-            }
 
-            response = requests.post(
-                f"{base_url}/index.php?/api/v2/add_run/{config['project_id']}",
-                json=run_data,
-                auth=auth
-            )
+            with requests.Session() as session:
+                session.auth = (config['testrail_user'], config['testrail_password'])
 
-            run_id = response.json()['id']
+                # Create test run
+                run_data = {
+                    'suite_id': config['suite_id'],
+                    'name': f"TestZen Run - {results['test_file']}",
+                    'description': f"Automated run from TestZen",
+                    'include_all': True
+                }
 
-            # Add results
-            for step in results.get('steps', []):
-                if step.get('test_case_id'):
-                    result_data = {
-                        'status_id': 1 if step['status'] == 'passed' else 5,
-                        'comment': step.get('message', ''),
-                        'elapsed': f"{step.get('duration', 0)}s"
-                    }
+                response = session.post(
+                    f"{base_url}/index.php?/api/v2/add_run/{config['project_id']}",
+                    json=run_data
+                )
+
+                run_id = response.json()['id']
+
+                # Add all results in a single bulk request
+                results_payload = {
+                    'results': [
+                        {
+                            'case_id': step['test_case_id'],
+                            'status_id': 1 if step['status'] == 'passed' else 5,
+                            'comment': step.get('message', ''),
+                            'elapsed': f"{step.get('duration', 0)}s"
+                        }
+                        for step in results.get('steps', [])
+                        if step.get('test_case_id')
+                    ]
+                }
 
-                    requests.post(
-                        f"{base_url}/index.php?/api/v2/add_result_for_case/{run_id}/{step['test_case_id']}",
-                        json=result_data,
-                        auth=auth
+                if results_payload['results']:
+                    session.post(
+                        f"{base_url}/index.php?/api/v2/add_results_for_cases/{run_id}",
+                        json=results_payload
                     )
 
-            self.logger.info(f"TestRail run created: {run_id}")
+            logger.info("TestRail run created: %s", run_id)
 
         except Exception as e:
-            self.logger.error(f"TestRail sync failed: {e}")
+            logger.error("TestRail sync failed: %s", e)
 
     def _format_results_for_jira(self, results: Dict[str, Any]) -> str:
         """Format test results for JIRA description"""
-        description = f"""
-h2. Test Execution Summary
-
-*Test File:* {results.get('test_file', 'Unknown')}
-*Status:* {results.get('status', 'Unknown')}
-*Total Steps:* {results.get('total_steps', 0)}
-*Passed:* {results.get('passed_steps', 0)}
-*Failed:* {results.get('failed_steps', 0)}
-*Duration:* {results.get('duration', 0)}s
-
-h3. Step Details
-
-||Step||Action||Status||Duration||
-"""
-        for step in results.get('steps', []):
-            description += f"|{step.get('step_no', '')}|{step.get('action', '')}|{step.get('status', '')}|{step.get('duration', 0)}s|\n"
-
-        return description
\ No newline at end of file
+        parts = [_JIRA_HEADER_TMPL.format(
+            test_file=results.get('test_file', 'Unknown'),
+            status=results.get('status', 'Unknown'),
+            total_steps=results.get('total_steps', 0),
+            passed_steps=results.get('passed_steps', 0),
+            failed_steps=results.get('failed_steps', 0),
+            duration=results.get('duration', 0)
+        )]
+        parts.extend(
+            f"|{step.get('step_no', '')}|{step.get('action', '')}|{step.get('status', '')}|{step.get('duration', 0)}s|\n"
+            for step in results.get('steps', [])
+        )
+
+        return ''.join(parts)
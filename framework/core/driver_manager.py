@@ -2,16 +2,43 @@
 Driver Manager - Handles Appium driver initialization and management
 """
 
-from appium import webdriver
-from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 import time
 
 logger = logging.getLogger(__name__)
 
+# How long a fetched driver.contexts list is reused before asking Appium again (seconds)
+_CONTEXTS_CACHE_TTL = 0.5
+
+# (capability, config key, default) per platform; a None config key means a fixed value
+_ANDROID_CAPS = (
+    ('platformName', None, 'Android'),
+    ('automationName', 'automation_name', 'UiAutomator2'),
+    ('deviceName', 'device_name', 'Android Device'),
+    ('app', 'app_path', ''),
+    ('appPackage', 'app_package', ''),
+    ('appActivity', 'app_activity', ''),
+    ('noReset', 'no_reset', True),
+    ('fullReset', 'full_reset', False),
+    ('autoGrantPermissions', 'auto_grant_permissions', True),
+)
+
+_IOS_CAPS = (
+    ('platformName', None, 'iOS'),
+    ('automationName', 'automation_name', 'XCUITest'),
+    ('deviceName', 'device_name', 'iPhone'),
+    ('platformVersion', 'platform_version', ''),
+    ('app', 'app_path', ''),
+    ('bundleId', 'bundle_id', ''),
+    ('noReset', 'no_reset', True),
+    ('fullReset', 'full_reset', False),
+)
+
+_CAPABILITY_TEMPLATES = {
+    'android': _ANDROID_CAPS,
+    'ios': _IOS_CAPS,
+}
+
 
 class DriverManager:
     """Manages Appium driver lifecycle and operations"""
@@ -21,14 +48,21 @@ class DriverManager:
         self.driver = None
         self.wait = None
         self.platform = config.get('platform', 'android').lower()
+        self._current_context = None
+        self._contexts_cache = None
+        self._contexts_cache_ts = 0.0
         
     def initialize_driver(self):
         """Initialize Appium driver with desired capabilities"""
+        # Appium/Selenium are imported here so importing this module stays cheap
+        from appium import webdriver
+        from selenium.webdriver.support.ui import WebDriverWait
+
         try:
             capabilities = self._build_capabilities()
             appium_server = self.config.get('appium_server', 'http://localhost:4723/wd/hub')
             
-            logger.info(f"Initializing {self.platform} driver...")
+            logger.info("Initializing %s driver...", self.platform)
             self.driver = webdriver.Remote(appium_server, capabilities)
             
             # Set implicit wait
@@ -43,44 +77,26 @@ class DriverManager:
             return self.driver
             
         except Exception as e:
-            logger.error(f"Failed to initialize driver: {str(e)}")
+            logger.error("Failed to initialize driver: %s", e)
             raise
     
     def _build_capabilities(self):
         """Build desired capabilities based on platform"""
+        # Single pass: emit only non-empty values
         caps = {}
-        
-        if self.platform == 'android':
-            caps = {
-                'platformName': 'Android',
-                'automationName': self.config.get('automation_name', 'UiAutomator2'),
-                'deviceName': self.config.get('device_name', 'Android Device'),
-                'app': self.config.get('app_path', ''),
-                'appPackage': self.config.get('app_package', ''),
-                'appActivity': self.config.get('app_activity', ''),
-                'noReset': self.config.get('no_reset', True),
-                'fullReset': self.config.get('full_reset', False),
-                'autoGrantPermissions': self.config.get('auto_grant_permissions', True)
-            }
-        elif self.platform == 'ios':
-            caps = {
-                'platformName': 'iOS',
-                'automationName': self.config.get('automation_name', 'XCUITest'),
-                'deviceName': self.config.get('device_name', 'iPhone'),
-                'platformVersion': self.config.get('platform_version', ''),
-                'app': self.config.get('app_path', ''),
-                'bundleId': self.config.get('bundle_id', ''),
-                'noReset': self.config.get('no_reset', True),
-                'fullReset': self.config.get('full_reset', False)
-            }
-        
+        for key, config_key, default in _CAPABILITY_TEMPLATES.get(self.platform, ()):
+            value = self.config.get(config_key, default) if config_key else default
+            if value != '':
+                caps[key] = value
+
         # Add any additional capabilities
         additional_caps = self.config.get('additional_capabilities', {})
-        caps.update(additional_caps)
-        
-        # Remove empty values
-        caps = {k: v for k, v in caps.items() if v != ''}
-        
+        for key, value in additional_caps.items():
+            if value != '':
+                caps[key] = value
+            else:
+                caps.pop(key, None)
+
         return caps
     
     def quit_driver(self):
@@ -90,42 +106,70 @@ class DriverManager:
                 self.driver.quit()
                 logger.info("Driver quit successfully")
             except Exception as e:
-                logger.error(f"Error quitting driver: {str(e)}")
+                logger.error("Error quitting driver: %s", e)
             finally:
                 self.driver = None
                 self.wait = None
+                self._current_context = None
+                self._invalidate_contexts_cache()
     
+    def _get_contexts(self):
+        """Return available contexts, reusing a recent result to avoid an Appium round trip"""
+        now = time.monotonic()
+        if self._contexts_cache is None or now - self._contexts_cache_ts >= _CONTEXTS_CACHE_TTL:
+            self._contexts_cache = self.driver.contexts
+            self._contexts_cache_ts = now
+        return self._contexts_cache
+
+    def _invalidate_contexts_cache(self):
+        """Forget cached contexts after a context switch"""
+        self._contexts_cache = None
+
     def switch_to_webview(self):
         """Switch context to webview"""
         try:
-            contexts = self.driver.contexts
-            for context in contexts:
-                if 'WEBVIEW' in context:
-                    self.driver.switch_to.context(context)
-                    logger.info(f"Switched to webview context: {context}")
+            # Already in a webview: confirm with current_context (much cheaper than
+            # listing contexts), since the shared driver can be switched, or the
+            # webview torn down, without going through this manager
+            if self._current_context and self._current_context.startswith('WEBVIEW'):
+                if self.driver.current_context == self._current_context:
                     return True
-            logger.warning("No webview context found")
-            return False
+                self._current_context = None
+
+            context = next((c for c in self._get_contexts() if c.startswith('WEBVIEW')), None)
+            if context is None:
+                logger.warning("No webview context found")
+                return False
+            self.driver.switch_to.context(context)
+            self._current_context = context
+            self._invalidate_contexts_cache()
+            logger.info("Switched to webview context: %s", context)
+            return True
         except Exception as e:
-            logger.error(f"Error switching to webview: {str(e)}")
+            logger.error("Error switching to webview: %s", e)
             return False
     
     def switch_to_native(self):
         """Switch context to native app"""
         try:
             self.driver.switch_to.context('NATIVE_APP')
+            self._current_context = 'NATIVE_APP'
+            self._invalidate_contexts_cache()
             logger.info("Switched to native context")
             return True
         except Exception as e:
-            logger.error(f"Error switching to native: {str(e)}")
+            logger.error("Error switching to native: %s", e)
             return False
     
     def take_screenshot(self, filename):
         """Take a screenshot and save it"""
         try:
-            self.driver.save_screenshot(filename)
-            logger.info(f"Screenshot saved: {filename}")
+            # Write the PNG bytes ourselves; skips save_screenshot's filename checks
+            png = self.driver.get_screenshot_as_png()
+            with open(filename, 'wb') as f:
+                f.write(png)
+            logger.info("Screenshot saved: %s", filename)
             return True
         except Exception as e:
-            logger.error(f"Error taking screenshot: {str(e)}")
+            logger.error("Error taking screenshot: %s", e)
             return False
\ No newline at end of file
@@ -5,12 +5,111 @@ Element Finder - Handles element location and interaction with smart wait strate
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 import logging
-import time
+import re
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of located elements remembered per ElementFinder
+_ELEMENT_CACHE_SIZE = 128
+
+_LOCATOR_MAP = {
+    'id': AppiumBy.ID,
+    'accessibility_id': AppiumBy.ACCESSIBILITY_ID,
+    'xpath': AppiumBy.XPATH,
+    'class': AppiumBy.CLASS_NAME,
+    'name': AppiumBy.NAME,
+    'android_uiautomator': AppiumBy.ANDROID_UIAUTOMATOR,
+    'ios_predicate': AppiumBy.IOS_PREDICATE_STRING,
+    'ios_class_chain': AppiumBy.IOS_CLASS_CHAIN,
+    'image': AppiumBy.IMAGE
+}
+
+
+@lru_cache(maxsize=32)
+def _resolve_by(locator_type):
+    """Map a locator type string (any case) to its AppiumBy strategy"""
+    locator_type = locator_type.lower()
+    try:
+        return _LOCATOR_MAP[locator_type]
+    except KeyError:
+        raise ValueError(f"Unknown locator type: {locator_type}") from None
+
+
+# wait_for_element condition names -> expected_conditions factories
+_CONDITION_MAP = {
+    'visible': EC.visibility_of_element_located,
+    'clickable': EC.element_to_be_clickable,
+    'present': EC.presence_of_element_located
+}
+
+
+def _clickable_or_offscreen(locator):
+    """Wait condition: (element, True) once the first match is clickable, or
+    (element, False) as soon as it is present but not displayed"""
+    def condition(driver):
+        elements = driver.find_elements(*locator)
+        if not elements:
+            return False
+        element = elements[0]
+        try:
+            if not element.is_displayed():
+                return element, False
+            return (element, True) if element.is_enabled() else False
+        except StaleElementReferenceException:
+            return False
+    return condition
+
+
+# Simple XPath shapes that have a native (server-side indexed) equivalent:
+#   //Class[@attr='value']  and  //Class[contains(@attr, 'value')]
+# Values containing quotes or backslashes, and classes that are not native
+# widget names (e.g. HTML tags), are left as XPath.
+_XPATH_EQUALS_RE = re.compile(r"""^//(\*|[\w.]+)\[@([\w-]+)\s*=\s*(['"])([^'"\\]*)\3\]$""")
+_XPATH_CONTAINS_RE = re.compile(r"""^//(\*|[\w.]+)\[contains\(@([\w-]+),\s*(['"])([^'"\\]*)\3\)\]$""")
+
+_UIAUTOMATOR_EQUALS = {'text': 'text', 'content-desc': 'description', 'resource-id': 'resourceId'}
+_UIAUTOMATOR_CONTAINS = {'text': 'textContains', 'content-desc': 'descriptionContains'}
+_IOS_ATTRIBUTES = frozenset(('name', 'label', 'value'))
+
+
+@lru_cache(maxsize=256)
+def _rewrite_xpath(platform, xpath):
+    """Translate a simple XPath into a native Appium locator, or return None"""
+    match = _XPATH_EQUALS_RE.match(xpath)
+    contains = False
+    if not match:
+        match = _XPATH_CONTAINS_RE.match(xpath)
+        contains = True
+        if not match:
+            return None
+
+    element_class, attribute, _, value = match.groups()
+
+    if platform == 'android' and (element_class == '*' or '.' in element_class):
+        method = (_UIAUTOMATOR_CONTAINS if contains else _UIAUTOMATOR_EQUALS).get(attribute)
+        if not method:
+            return None
+        selector = f'new UiSelector().{method}("{value}")'
+        if element_class != '*':
+            selector += f'.className("{element_class}")'
+        return 'android_uiautomator', selector
+
+    if (platform == 'ios' and attribute in _IOS_ATTRIBUTES
+            and (element_class == '*' or element_class.startswith('XCUIElementType'))):
+        if contains:
+            predicate = f"{attribute} CONTAINS '{value}'"
+            if element_class != '*':
+                predicate = f"type == '{element_class}' AND {predicate}"
+            return 'ios_predicate', predicate
+        return 'ios_class_chain', f"**/{element_class}[`{attribute} == '{value}'`]"
+
+    return None
+
 
 class ElementFinder:
     """Handles element finding with various strategies"""
@@ -19,37 +118,54 @@ class ElementFinder:
         self.driver = driver
         self.wait_timeout = wait_timeout
         self.wait = WebDriverWait(driver, wait_timeout)
+        self._element_cache = OrderedDict()
+        self._screen_key = None
+        self._context = None
+        # Session implicit wait, read once on first use (DriverManager sets it at startup)
+        self._implicit_wait = None
+        # Session-constant: platform never changes; window size only on rotation
+        self._platform = driver.capabilities.get('platformName', '').lower()
+        self._window_size = None
+        if self._platform == 'android':
+            self._scroll_down, self._scroll_up = self._scroll_down_android, self._scroll_up_android
+        else:
+            self._scroll_down, self._scroll_up = self._scroll_down_ios, self._scroll_up_ios
         
     def find_element(self, locator_type, locator_value, timeout=None):
         """Find element with specified locator strategy"""
+        locator_type, locator_value = self._maybe_rewrite_locator(locator_type, locator_value)
         timeout = timeout or self.wait_timeout
         wait = WebDriverWait(self.driver, timeout)
         
+        cache_key = (self._get_screen_key(), locator_type, locator_value)
+        element = self._get_cached_element(cache_key)
+        if element is not None:
+            logger.info(f"Found element (cached): {locator_type}={locator_value}")
+            return element
+
         try:
             by = self._get_by_type(locator_type)
             
-            # First check if element exists
-            element = wait.until(
-                EC.presence_of_element_located((by, locator_value))
-            )
-            
-            # Try to scroll to element if needed
-            if not self._is_element_visible(element):
+            # One wait covers the common case; it also ends early when the
+            # element is present but off-screen, which is then scrolled into view
+            element, displayed = wait.until(_clickable_or_offscreen((by, locator_value)))
+            if not displayed:
                 self._scroll_to_element(element)
+                element = wait.until(
+                    EC.element_to_be_clickable((by, locator_value))
+                )
             
-            # Wait for element to be clickable
-            element = wait.until(
-                EC.element_to_be_clickable((by, locator_value))
-            )
-            
+            self._cache_element(cache_key, element)
             logger.info(f"Found element: {locator_type}={locator_value}")
             return element
             
         except TimeoutException:
             logger.error(f"Element not found: {locator_type}={locator_value}")
             # Try scrolling and searching
-            if self._scroll_and_find(locator_type, locator_value):
-                return self.find_element(locator_type, locator_value, timeout=5)
+            element = self._scroll_and_find(locator_type, locator_value)
+            if element is not None:
+                self._cache_element(cache_key, element)
+                return element
             raise
         except Exception as e:
             logger.error(f"Error finding element: {str(e)}")
@@ -57,6 +173,7 @@ class ElementFinder:
     
     def find_elements(self, locator_type, locator_value, timeout=None):
         """Find multiple elements with specified locator strategy"""
+        locator_type, locator_value = self._maybe_rewrite_locator(locator_type, locator_value)
         timeout = timeout or self.wait_timeout
         wait = WebDriverWait(self.driver, timeout)
         
@@ -75,26 +192,28 @@ class ElementFinder:
             return []
     
     def wait_for_element(self, locator_type, locator_value, timeout=None, condition='visible'):
-        """Wait for element with specific condition"""
+        """Wait for element with specific condition
+        
+        condition may also be a list/tuple of conditions; the wait ends as soon
+        as any of them is met.
+        """
+        locator_type, locator_value = self._maybe_rewrite_locator(locator_type, locator_value)
         timeout = timeout or self.wait_timeout
         wait = WebDriverWait(self.driver, timeout)
         by = self._get_by_type(locator_type)
         
         try:
-            if condition == 'visible':
-                element = wait.until(
-                    EC.visibility_of_element_located((by, locator_value))
-                )
-            elif condition == 'clickable':
-                element = wait.until(
-                    EC.element_to_be_clickable((by, locator_value))
-                )
-            elif condition == 'present':
-                element = wait.until(
-                    EC.presence_of_element_located((by, locator_value))
-                )
+            conditions = (condition,) if isinstance(condition, str) else tuple(condition)
+            expectations = []
+            for name in conditions:
+                if name not in _CONDITION_MAP:
+                    raise ValueError(f"Unknown condition: {name}")
+                expectations.append(_CONDITION_MAP[name]((by, locator_value)))
+            
+            if len(expectations) == 1:
+                element = wait.until(expectations[0])
             else:
-                raise ValueError(f"Unknown condition: {condition}")
+                element = wait.until(EC.any_of(*expectations))
             
             logger.info(f"Element is {condition}: {locator_type}={locator_value}")
             return element
@@ -106,44 +225,106 @@ class ElementFinder:
             return None
     
     def is_element_present(self, locator_type, locator_value, timeout=3):
-        """Check if element is present without throwing exception"""
+        """Check if element is present without throwing exception
+        
+        timeout=0 probes once with find_elements, with the implicit wait suspended so it never blocks.
+        """
         try:
-            self.wait_for_element(locator_type, locator_value, timeout=timeout, condition='present')
-            return True
-        except:
+            if timeout == 0:
+                locator_type, locator_value = self._maybe_rewrite_locator(locator_type, locator_value)
+                by = self._get_by_type(locator_type)
+                with self._implicit_wait_suspended():
+                    return bool(self.driver.find_elements(by, locator_value))
+            return self.wait_for_element(locator_type, locator_value, timeout=timeout, condition='present') is not None
+        except Exception:
             return False
     
-    def _get_by_type(self, locator_type):
-        """Convert string locator type to By object"""
-        locator_map = {
-            'id': AppiumBy.ID,
-            'accessibility_id': AppiumBy.ACCESSIBILITY_ID,
-            'xpath': AppiumBy.XPATH,
-            'class': AppiumBy.CLASS_NAME,
-            'name': AppiumBy.NAME,
-            'android_uiautomator': AppiumBy.ANDROID_UIAUTOMATOR,
-            'ios_predicate': AppiumBy.IOS_PREDICATE_STRING,
-            'ios_class_chain': AppiumBy.IOS_CLASS_CHAIN,
-            'image': AppiumBy.IMAGE
-        }
-        
-        locator_type = locator_type.lower()
-        if locator_type not in locator_map:
-            raise ValueError(f"Unknown locator type: {locator_type}")
+    def invalidate_cache(self):
+        """Forget cached elements and the screen key
         
-        return locator_map[locator_type]
-    
-    def _is_element_visible(self, element):
-        """Check if element is visible in viewport"""
+        Scrolling and swiping call this themselves; callers that navigate, switch
+        context or restart the app must call it too, since cached elements are
+        only re-checked with is_displayed().
+        """
+        self._element_cache.clear()
+        self._screen_key = None
+        self._context = None
+
+    def _get_screen_key(self):
+        """Identify the current screen (activity on Android, context elsewhere), queried once per invalidate_cache()"""
+        if self._platform != 'android':
+            return self._get_context()
+        if self._screen_key is None:
+            try:
+                self._screen_key = self.driver.current_activity
+            except Exception:
+                self._screen_key = ''
+        return self._screen_key
+
+    def _get_context(self):
+        """Current driver context, queried once per invalidate_cache()"""
+        if self._context is None:
+            try:
+                self._context = self.driver.current_context
+            except Exception:
+                self._context = ''
+        return self._context
+
+    def _get_cached_element(self, cache_key):
+        """Return a cached element that is still attached and displayed, else None"""
+        element = self._element_cache.get(cache_key)
+        if element is None:
+            return None
         try:
-            return element.is_displayed()
-        except:
-            return False
+            if element.is_displayed():
+                self._element_cache.move_to_end(cache_key)
+                return element
+        except StaleElementReferenceException:
+            pass
+        except Exception as e:
+            logger.debug("Discarding cached element: %s", e)
+        del self._element_cache[cache_key]
+        return None
+
+    def _cache_element(self, cache_key, element):
+        """Remember a located element, evicting the least recently used entry"""
+        self._element_cache[cache_key] = element
+        self._element_cache.move_to_end(cache_key)
+        if len(self._element_cache) > _ELEMENT_CACHE_SIZE:
+            self._element_cache.popitem(last=False)
+
+    def _get_window_size(self):
+        """Return the screen size, fetched from Appium once per session"""
+        if self._window_size is None:
+            self._window_size = self.driver.get_window_size()
+        return self._window_size
+
+    def reset_window_size(self):
+        """Forget the cached screen size; call after rotating the device"""
+        self._window_size = None
+
+    def _maybe_rewrite_locator(self, locator_type, locator_value):
+        """Swap simple XPath locators for faster native strategies where possible"""
+        if locator_type.lower() != 'xpath':
+            return locator_type, locator_value
+        rewritten = _rewrite_xpath(self._platform, locator_value)
+        if rewritten is None or not self._in_native_context():
+            return locator_type, locator_value
+        logger.debug("Rewrote xpath %s as %s=%s", locator_value, *rewritten)
+        return rewritten
+
+    def _in_native_context(self):
+        """Native strategies only match in the app context, not in a WEBVIEW's DOM"""
+        return self._get_context() == 'NATIVE_APP'
+
+    def _get_by_type(self, locator_type):
+        """Convert string locator type to By object"""
+        return _resolve_by(locator_type)
     
     def _scroll_to_element(self, element):
         """Scroll to make element visible"""
         try:
-            if self.driver.capabilities.get('platformName', '').lower() == 'android':
+            if self._platform == 'android':
                 self.driver.execute_script('mobile: scrollToElement', {
                     'element': element.id,
                     'strategy': 'accessibility id',
@@ -155,6 +336,7 @@ class ElementFinder:
                     'element': element.id,
                     'toVisible': True
                 })
+            self.invalidate_cache()
             logger.info("Scrolled to element")
             return True
         except Exception as e:
@@ -162,32 +344,37 @@ class ElementFinder:
             return False
     
     def _scroll_and_find(self, locator_type, locator_value, max_scrolls=5):
-        """Scroll and search for element"""
-        platform = self.driver.capabilities.get('platformName', '').lower()
-        
-        for i in range(max_scrolls):
-            if self.is_element_present(locator_type, locator_value, timeout=1):
-                return True
-            
-            # Perform scroll
-            if platform == 'android':
-                self._scroll_down_android()
-            else:
-                self._scroll_down_ios()
-            
-            time.sleep(0.5)
-        
-        return False
+        """Scroll down up to max_scrolls times, probing after each swipe; returns the element or None"""
+        by = self._get_by_type(locator_type)
+        with self._implicit_wait_suspended():
+            for _ in range(max_scrolls):
+                self._scroll_down()
+                elements = self.driver.find_elements(by, locator_value)
+                if elements:
+                    return elements[0]
+        return None
+    
+    @contextmanager
+    def _implicit_wait_suspended(self):
+        """Drop the driver's implicit wait to 0 so find_elements answers a miss immediately"""
+        if self._implicit_wait is None:
+            self._implicit_wait = self.driver.timeouts.implicit_wait
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(self._implicit_wait)
     
     def _scroll_down_android(self):
         """Scroll down on Android"""
         try:
-            size = self.driver.get_window_size()
+            size = self._get_window_size()
             start_x = size['width'] // 2
             start_y = size['height'] * 0.8
             end_y = size['height'] * 0.2
             
             self.driver.swipe(start_x, start_y, start_x, end_y, duration=800)
+            self.invalidate_cache()
         except Exception as e:
             logger.warning(f"Error scrolling: {str(e)}")
     
@@ -195,18 +382,23 @@ class ElementFinder:
         """Scroll down on iOS"""
         try:
             self.driver.execute_script('mobile: scroll', {'direction': 'down'})
+            self.invalidate_cache()
         except Exception as e:
             logger.warning(f"Error scrolling: {str(e)}")
     
     def scroll_up(self):
         """Scroll up"""
-        platform = self.driver.capabilities.get('platformName', '').lower()
-        
-        if platform == 'android':
-            size = self.driver.get_window_size()
-            start_x = size['width'] // 2
-            start_y = size['height'] * 0.2
-            end_y = size['height'] * 0.8
-            self.driver.swipe(start_x, start_y, start_x, end_y, duration=800)
-        else:
-            self.driver.execute_script('mobile: scroll', {'direction': 'up'})
\ No newline at end of file
+        self.invalidate_cache()
+        self._scroll_up()
+    
+    def _scroll_up_android(self):
+        """Scroll up on Android"""
+        size = self._get_window_size()
+        start_x = size['width'] // 2
+        start_y = size['height'] * 0.2
+        end_y = size['height'] * 0.8
+        self.driver.swipe(start_x, start_y, start_x, end_y, duration=800)
+    
+    def _scroll_up_ios(self):
+        """Scroll up on iOS"""
+        self.driver.execute_script('mobile: scroll', {'direction': 'up'})
@@ -2,21 +2,90 @@
 Excel Parser - Reads test cases and steps from Excel files
 """
 
-import pandas as pd
+import openpyxl
 import logging
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Optional sheets read alongside the test sheet; other sheets (reports, instructions) are skipped
+_AUXILIARY_SHEETS = ('Locators', 'Scenarios', 'TestData')
+
+_VALID_ACTIONS = frozenset({
+    'click', 'tap', 'enter', 'type', 'clear', 'swipe', 'scroll',
+    'verify', 'assert', 'wait', 'screenshot', 'switch_context',
+    'navigate', 'back', 'forward', 'refresh', 'close', 'quit',
+    'if', 'else', 'endif', 'loop', 'endloop', 'call', 'return'
+})
+
+
+def _read_sheet_rows(worksheet) -> Tuple[List[str], List[tuple]]:
+    """Stream a worksheet into (headers, value tuples); trailing blank rows are dropped, empty cells are None"""
+    rows_iter = worksheet.iter_rows(values_only=True)
+    header_row = next(rows_iter, None)
+    if header_row is None:
+        return [], []
+
+    # Name headers the way pandas did: blank -> 'Unnamed: N', duplicates -> 'Name.1'
+    headers = []
+    seen = {}
+    for position, header in enumerate(header_row):
+        name = f"Unnamed: {position}" if header is None else str(header)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        headers.append(name)
+
+    rows = []
+    trailing_blank = 0
+    for values in rows_iter:
+        rows.append(values)
+        trailing_blank = trailing_blank + 1 if all(value is None for value in values) else 0
+
+    if trailing_blank:
+        del rows[-trailing_blank:]
+
+    return headers, rows
+
+
+def _row_dicts(headers: List[str], rows: List[tuple], empty: Any = None) -> List[Dict[str, Any]]:
+    """Build one dict per row, replacing empty (None) cells with `empty`"""
+    if empty is None:
+        return [dict(zip(headers, values)) for values in rows]
+    return [dict(zip(headers, [empty if value is None else value for value in values])) for values in rows]
+
 
 class ExcelParser:
     """Parse test cases from Excel files"""
     
     def __init__(self, excel_file_path):
         self.excel_file = excel_file_path
-        self.test_data = None
+        self.test_columns = []
+        self._column_map = {}
+        self.test_rows = None
         self.locators_data = None
+        self._locator_index = {}
+        self._sheets = None
+        
+    def _open_workbook(self):
+        """Open the workbook in streaming (read-only, cached values) mode"""
+        return openpyxl.load_workbook(self.excel_file, read_only=True, data_only=True)
+        
+    def _read_sheets(self, test_sheet='TestCases'):
+        """Parse the test sheet and the auxiliary sheets present into the sheet cache"""
+        wanted = {test_sheet, *_AUXILIARY_SHEETS}
+        workbook = self._open_workbook()
+        try:
+            self._sheets = {
+                name: _read_sheet_rows(workbook[name])
+                for name in workbook.sheetnames
+                if name in wanted
+            }
+        finally:
+            workbook.close()
         
     def load_test_file(self, sheet_name='TestCases'):
         """Load test cases from Excel file"""
@@ -24,23 +93,29 @@ class ExcelParser:
             if not os.path.exists(self.excel_file):
                 raise FileNotFoundError(f"Excel file not found: {self.excel_file}")
             
+            # Parse the sheets we use in one pass over the file; later sheet lookups hit this cache
+            self._read_sheets(sheet_name)
+            
             # Read the test cases sheet
-            self.test_data = pd.read_excel(self.excel_file, sheet_name=sheet_name)
+            headers, rows = self._sheets[sheet_name]
             
             # Clean column names
-            self.test_data.columns = [col.strip() for col in self.test_data.columns]
+            self.test_columns = [col.strip() for col in headers]
+            self._column_map = {}
+            for col in self.test_columns:
+                self._column_map.setdefault(col.lower(), col)
             
-            # Fill NaN values with empty string
-            self.test_data = self.test_data.fillna('')
+            # Fill empty cells with empty string
+            self.test_rows = _row_dicts(self.test_columns, rows, empty='')
             
-            logger.info(f"Loaded {len(self.test_data)} test steps from {sheet_name}")
+            logger.info(f"Loaded {len(self.test_rows)} test steps from {sheet_name}")
             
             # Try to load locators sheet if exists
-            try:
-                self.locators_data = pd.read_excel(self.excel_file, sheet_name='Locators')
-                self.locators_data = self.locators_data.fillna('')
+            if 'Locators' in self._sheets:
+                self.locators_data = _row_dicts(*self._sheets['Locators'], empty='')
+                self._build_locator_index()
                 logger.info("Loaded locators sheet")
-            except:
+            else:
                 logger.info("No locators sheet found")
             
             return True
@@ -51,14 +126,14 @@ class ExcelParser:
     
     def is_business_scenario_format(self) -> bool:
         """Detect if the Excel file uses business scenario format vs technical steps"""
-        if self.test_data is None:
+        if self.test_rows is None:
             return False
         
         # Check for business scenario columns
         scenario_indicators = ['Scenario', 'Business Process', 'Test Case', 'User Story']
         technical_indicators = ['Action', 'Locator Type', 'Locator Value']
         
-        columns = [col.lower() for col in self.test_data.columns]
+        columns = [col.lower() for col in self.test_columns]
         
         has_scenario_cols = any(indicator.lower() in ' '.join(columns) for indicator in scenario_indicators)
         has_technical_cols = any(indicator.lower().replace(' ', '_') in ' '.join(columns) for indicator in technical_indicators)
@@ -67,8 +142,8 @@ class ExcelParser:
         return has_scenario_cols and not has_technical_cols
 
     def get_test_steps(self) -> List[Dict[str, Any]]:
-        """Get all test steps as a list of dictionaries"""
-        if self.test_data is None:
+        """Get all test steps as a list of dictionaries (empty text fields are omitted)"""
+        if self.test_rows is None:
             raise ValueError("Test data not loaded. Call load_test_file() first")
         
         # Check if this is business scenario format
@@ -76,28 +151,59 @@ class ExcelParser:
             return self.get_business_scenarios()
         
         # Original technical steps format
+        rows = self.test_rows
+        
+        def column(name, default=''):
+            """All values of one column, or the default for every row if it is absent"""
+            if name in self.test_columns:
+                return [row.get(name, default) for row in rows]
+            return [default] * len(rows)
+        
+        def text(name, default=''):
+            return list(map(str, column(name, default)))
+        
+        def lowered(name, default=''):
+            return list(map(str.lower, map(str, column(name, default))))
+        
+        # Normalise column by column (C-level map) rather than cell by cell inside the step loop
+        columns = zip(
+            text('Description'),
+            lowered('Action'),
+            text('Element'),
+            text('Locator Type'),
+            text('Locator Value'),
+            text('Test Data'),
+            text('Expected Result'),
+            [int(value) if value else 0 for value in column('Wait Time', 0)],
+            [value == 'yes' for value in lowered('Screenshot', 'no')],
+            [value == 'yes' for value in lowered('Optional', 'no')],
+            text('Condition'),
+            lowered('On Fail', 'stop')
+        )
+        
         test_steps = []
         
-        for index, row in self.test_data.iterrows():
+        for index, (description, action, locator_name, locator_type, locator_value, test_data,
+                    expected, wait_time, screenshot, optional, condition, on_fail) in enumerate(columns):
             step = {
                 'step_no': index + 1,
-                'description': str(row.get('Description', '')),
-                'action': str(row.get('Action', '')).lower(),
-                'locator_name': str(row.get('Element', '')),
-                'locator_type': str(row.get('Locator Type', '')),
-                'locator_value': str(row.get('Locator Value', '')),
-                'test_data': str(row.get('Test Data', '')),
-                'expected': str(row.get('Expected Result', '')),
-                'wait_time': int(row.get('Wait Time', 0)) if row.get('Wait Time', '') else 0,
-                'screenshot': str(row.get('Screenshot', 'no')).lower() == 'yes',
-                'optional': str(row.get('Optional', 'no')).lower() == 'yes',
-                'condition': str(row.get('Condition', '')),
-                'on_fail': str(row.get('On Fail', 'stop')).lower()
+                'action': action,
+                'wait_time': wait_time,
+                'screenshot': screenshot,
+                'optional': optional,
+                'on_fail': on_fail
             }
             
+            # Text fields are only stored when filled in; consumers read them with .get(key, '')
+            for key, value in (('description', description), ('locator_name', locator_name),
+                               ('locator_type', locator_type), ('locator_value', locator_value),
+                               ('test_data', test_data), ('expected', expected), ('condition', condition)):
+                if value:
+                    step[key] = value
+            
             # If locator name is provided, try to get from locators sheet
-            if step['locator_name'] and self.locators_data is not None:
-                locator_info = self._get_locator_info(step['locator_name'])
+            if locator_name and self.locators_data is not None:
+                locator_info = self._get_locator_info(locator_name)
                 if locator_info:
                     step.update(locator_info)
             
@@ -107,12 +213,12 @@ class ExcelParser:
     
     def get_business_scenarios(self) -> List[Dict[str, Any]]:
         """Get business scenarios for processing with scenario processor"""
-        if self.test_data is None:
+        if self.test_rows is None:
             raise ValueError("Test data not loaded. Call load_test_file() first")
         
         scenarios = []
         
-        for index, row in self.test_data.iterrows():
+        for index, row in enumerate(self.test_rows):
             # Map various possible column names to standard format
             scenario = {
                 'step_no': index + 1,
@@ -137,50 +243,59 @@ class ExcelParser:
     def _get_column_value(self, row, possible_columns):
         """Get value from row using multiple possible column names"""
         for col in possible_columns:
-            if col in row:
-                value = row[col]
-                if pd.notna(value):
+            # Exact match first, then case-insensitive via the column index
+            actual_col = col if col in row else self._column_map.get(col.lower())
+            if actual_col is not None:
+                value = row[actual_col]
+                if value is not None:
                     return str(value).strip()
-            
-            # Try case-insensitive match
-            for actual_col in row.index:
-                if actual_col.lower() == col.lower():
-                    value = row[actual_col]
-                    if pd.notna(value):
-                        return str(value).strip()
         
         return ''
     
+    def _build_locator_index(self):
+        """Index locator rows by lowercased name; the first row for a name wins"""
+        self._locator_index = {}
+        for locator_row in self.locators_data:
+            if 'Name' not in locator_row:
+                logger.warning("Locators sheet has no 'Name' column")
+                break
+            self._locator_index.setdefault(
+                str(locator_row['Name']).lower(),
+                (str(locator_row.get('Type', '')), str(locator_row.get('Value', '')))
+            )
+    
     def _get_locator_info(self, locator_name) -> Dict[str, str]:
         """Get locator information from locators sheet"""
-        try:
-            locator_row = self.locators_data[
-                self.locators_data['Name'].str.lower() == locator_name.lower()
-            ]
-            
-            if not locator_row.empty:
-                return {
-                    'locator_type': str(locator_row.iloc[0].get('Type', '')),
-                    'locator_value': str(locator_row.iloc[0].get('Value', ''))
-                }
-        except Exception as e:
-            logger.warning(f"Could not find locator {locator_name}: {str(e)}")
+        locator = self._locator_index.get(locator_name.lower())
+        if locator is None:
+            return {}
         
-        return {}
+        locator_type, locator_value = locator
+        return {
+            'locator_type': locator_type,
+            'locator_value': locator_value
+        }
+    
+    def _load_sheet(self, sheet_name) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Read one sheet as (headers, row dicts); raises KeyError if the sheet is missing"""
+        if self._sheets is None:
+            self._read_sheets()
+        headers, rows = self._sheets[sheet_name]
+        return headers, _row_dicts(headers, rows)
     
     def get_test_scenarios(self) -> List[Dict[str, Any]]:
         """Get test scenarios if sheet exists"""
         try:
-            scenarios_df = pd.read_excel(self.excel_file, sheet_name='Scenarios')
+            _, scenario_rows = self._load_sheet('Scenarios')
             scenarios = []
             
-            for index, row in scenarios_df.iterrows():
+            for index, row in enumerate(scenario_rows):
                 scenario = {
-                    'name': str(row.get('Scenario Name', f'Scenario_{index+1}')),
-                    'description': str(row.get('Description', '')),
-                    'test_steps': str(row.get('Test Steps', '')).split(','),
-                    'data_set': str(row.get('Data Set', '')),
-                    'enabled': str(row.get('Enabled', 'yes')).lower() == 'yes'
+                    'name': str(row.get('Scenario Name') or f'Scenario_{index+1}'),
+                    'description': str(row.get('Description') or ''),
+                    'test_steps': str(row.get('Test Steps') or '').split(','),
+                    'data_set': str(row.get('Data Set') or ''),
+                    'enabled': str(row.get('Enabled') or 'yes').lower() == 'yes'
                 }
                 scenarios.append(scenario)
             
@@ -193,16 +308,18 @@ class ExcelParser:
     def get_test_data_sets(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get test data sets if sheet exists"""
         try:
-            data_df = pd.read_excel(self.excel_file, sheet_name='TestData')
+            headers, data_rows = self._load_sheet('TestData')
             data_sets = {}
             
             # Group by data set name
-            if 'DataSet' in data_df.columns:
-                for data_set_name, group in data_df.groupby('DataSet'):
-                    data_sets[data_set_name] = group.to_dict('records')
+            if 'DataSet' in headers:
+                for row in data_rows:
+                    data_set_name = row['DataSet']
+                    if data_set_name is not None:
+                        data_sets.setdefault(data_set_name, []).append(row)
             else:
                 # If no DataSet column, use all as default
-                data_sets['default'] = data_df.to_dict('records')
+                data_sets['default'] = data_rows
             
             return data_sets
             
@@ -218,29 +335,22 @@ class ExcelParser:
         # Check required columns
         required_columns = ['Action']
         for col in required_columns:
-            if col not in self.test_data.columns:
+            if col not in self.test_columns:
                 errors.append(f"Required column '{col}' not found")
         
         # Check for at least one locator method
         has_locator = False
-        if 'Element' in self.test_data.columns or \
-           ('Locator Type' in self.test_data.columns and 'Locator Value' in self.test_data.columns):
+        if 'Element' in self.test_columns or \
+           ('Locator Type' in self.test_columns and 'Locator Value' in self.test_columns):
             has_locator = True
         
         if not has_locator:
             warnings.append("No locator columns found. Make sure to provide either 'Element' or 'Locator Type' and 'Locator Value'")
         
         # Validate actions
-        valid_actions = [
-            'click', 'tap', 'enter', 'type', 'clear', 'swipe', 'scroll',
-            'verify', 'assert', 'wait', 'screenshot', 'switch_context',
-            'navigate', 'back', 'forward', 'refresh', 'close', 'quit',
-            'if', 'else', 'endif', 'loop', 'endloop', 'call', 'return'
-        ]
-        
-        for index, row in self.test_data.iterrows():
+        for index, row in enumerate(self.test_rows):
             action = str(row.get('Action', '')).lower()
-            if action and action not in valid_actions:
+            if action and action not in _VALID_ACTIONS:
                 warnings.append(f"Row {index+1}: Unknown action '{action}'")
         
         return errors, warnings
\ No newline at end of file
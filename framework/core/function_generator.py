@@ -3,9 +3,15 @@ Function Generator - Auto-generates reusable functions from Excel patterns
 Converts Excel test steps into callable functions like verifySettingsScreenDisplayed()
 """
 
+import atexit
+import heapq
 import logging
 import re
 import json
+import threading
+import time
+import weakref
+from functools import lru_cache
 from typing import Dict, List, Any, Callable
 import sys
 import os
@@ -14,6 +20,172 @@ from utils.helpers import save_json_safely, load_json_safely
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between usage-count writes; pending changes are flushed at the end of a run or at exit
+_FLUSH_INTERVAL = 5.0
+
+# Live generators per function cache file; one atexit hook per file flushes them all
+_GENERATORS_BY_PATH = {}
+# Serialises the read-merge-write of each function cache file within the process
+_SAVE_LOCKS = {}
+
+
+def _flush_generators(path):
+    """atexit hook: write out unsaved changes of every live generator for path"""
+    for generator in list(_GENERATORS_BY_PATH.get(path, ())):
+        generator.flush()
+
+# Screen/page patterns, in priority order
+_SCREEN_PATTERNS = tuple(re.compile(p) for p in (
+    r'(\w+)\s*screen',
+    r'(\w+)\s*page',
+    r'(\w+)\s*dashboard',
+    r'(\w+)\s*menu',
+    r'manage\s*(\w+)',
+    r'(\w+)\s*billing',
+    r'(\w+)\s*payment',
+    r'(\w+)\s*confirmation'
+))
+
+# Element patterns, tried before the plain keywords below
+_ELEMENT_PATTERNS = tuple(re.compile(p) for p in (
+    r'(\w+)\s*button',
+    r'(\w+)\s*tab',
+    r'(\w+)\s*field',
+    r'(\w+)\s*input'
+))
+
+_ELEMENT_KEYWORDS = ('submit', 'continue', 'next', 'back', 'edit', 'save', 'settings', 'alerts')
+_ELEMENT_KEYWORD_RANK = {keyword: rank for rank, keyword in enumerate(_ELEMENT_KEYWORDS)}
+# Lookahead so overlapping keywords (e.g. 'savedit') are all reported in one scan
+_ELEMENT_KEYWORD_RE = re.compile('(?=(%s))' % '|'.join(_ELEMENT_KEYWORDS))
+
+# Characters that mark a step value as parameterizable ({name} or $name)
+_PARAM_CHAR_RE = re.compile(r'[{$]')
+
+# Single-pass gates: one scan tells whether any of the patterns above can match,
+# so texts without a hit skip the ordered (priority-preserving) per-pattern loop
+_SCREEN_ANY_RE = re.compile('|'.join(p.pattern for p in _SCREEN_PATTERNS))
+_ELEMENT_ANY_RE = re.compile('|'.join([p.pattern for p in _ELEMENT_PATTERNS] + list(_ELEMENT_KEYWORDS)))
+
+
+def _extract_screen_name(description: str, locator_value: str, expected: str) -> str:
+    """Extract screen name from various sources"""
+    # Priority: expected result > description > locator
+    text_sources = [expected, description, locator_value]
+    
+    for text in text_sources:
+        if not text:
+            continue
+        
+        text_lower = text.lower()
+        if not _SCREEN_ANY_RE.search(text_lower):
+            continue
+        
+        for pattern in _SCREEN_PATTERNS:
+            match = pattern.search(text_lower)
+            if match:
+                return match.group(1).title()
+    
+    return ""
+
+
+def _extract_element_name(description: str, locator_value: str) -> str:
+    """Extract element name from description or locator"""
+    text_sources = [description, locator_value]
+    
+    for text in text_sources:
+        if not text:
+            continue
+        
+        text_lower = text.lower()
+        if not _ELEMENT_ANY_RE.search(text_lower):
+            continue
+        
+        for pattern in _ELEMENT_PATTERNS:
+            match = pattern.search(text_lower)
+            if match:
+                return match.group(1).title()
+        
+        keywords = _ELEMENT_KEYWORD_RE.findall(text_lower)
+        if keywords:
+            return min(keywords, key=_ELEMENT_KEYWORD_RANK.__getitem__).title()
+    
+    # Extract from locator ID
+    _, sep, id_part = locator_value.rpartition('id/')
+    if sep:
+        # Convert snake_case or camelCase to TitleCase ('_' resets title-casing like a word break)
+        if '_' in id_part:
+            return id_part.title().replace('_', '')
+        elif any(c.isupper() for c in id_part[1:]):
+            # camelCase - capitalize first letter
+            return id_part[0].upper() + id_part[1:]
+    
+    return ""
+
+
+@lru_cache(maxsize=4096)
+def _classify(action: str, description: str, locator_value: str, expected: str) -> str:
+    """Generate function name from the fields of a step signature"""
+    desc_lower = description.lower()
+    
+    # Pattern 1: Verify actions -> verify[ScreenName]Displayed()
+    if action in ['verify', 'assert', 'validate']:
+        if 'screen' in desc_lower or 'page' in desc_lower or 'displayed' in desc_lower:
+            screen_name = _extract_screen_name(description, locator_value, expected)
+            if screen_name:
+                return f"verify{screen_name}Displayed"
+        
+        elif 'button' in desc_lower or 'element' in desc_lower:
+            element_name = _extract_element_name(description, locator_value)
+            if element_name:
+                return f"verify{element_name}Visible"
+        
+        elif expected:
+            element_name = _extract_element_name(description, expected)
+            if element_name:
+                return f"verify{element_name}Text"
+    
+    # Pattern 2: Click actions -> click[ElementName]()
+    elif action in ['click', 'tap']:
+        element_name = _extract_element_name(description, locator_value)
+        if element_name:
+            if 'button' in desc_lower:
+                return f"click{element_name}Button"
+            elif 'tab' in desc_lower:
+                return f"click{element_name}Tab"
+            else:
+                return f"click{element_name}"
+    
+    # Pattern 3: Input actions -> enter[FieldName]()
+    elif action in ['type', 'enter', 'input']:
+        field_name = _extract_element_name(description, locator_value)
+        if field_name:
+            return f"enter{field_name}"
+    
+    # Pattern 4: Navigation -> navigateTo[ScreenName]()
+    elif action in ['navigate', 'goto']:
+        screen_name = _extract_screen_name(description, locator_value, expected)
+        if screen_name:
+            return f"navigateTo{screen_name}"
+    
+    # Pattern 5: Wait actions -> waitFor[ScreenName]()
+    elif action == 'wait' and ('screen' in desc_lower or 'page' in desc_lower):
+        screen_name = _extract_screen_name(description, locator_value, expected)
+        if screen_name:
+            return f"waitFor{screen_name}"
+    
+    return ""
+
+
+def _step_signature(step: Dict[str, Any]) -> tuple:
+    """Fields that determine a step's generated function name"""
+    return (
+        step.get('action', '').lower(),
+        step.get('description', ''),
+        step.get('locator_value', ''),
+        step.get('expected', '')
+    )
+
 
 class FunctionGenerator:
     """Auto-generates and manages reusable test functions from Excel patterns"""
@@ -24,6 +196,15 @@ class FunctionGenerator:
         self.function_cache = load_json_safely(function_cache_path)
         self.action_handler = None
         self.element_finder = None
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        # Weak references, so the exit hook does not keep generators alive
+        generators = _GENERATORS_BY_PATH.get(function_cache_path)
+        if generators is None:
+            generators = _GENERATORS_BY_PATH[function_cache_path] = weakref.WeakSet()
+            atexit.register(_flush_generators, function_cache_path)
+        generators.add(self)
+        self._save_lock = _SAVE_LOCKS.setdefault(function_cache_path, threading.Lock())
         
     def set_handlers(self, action_handler, element_finder):
         """Set the action handler and element finder for function execution"""
@@ -33,16 +214,21 @@ class FunctionGenerator:
     def generate_functions_from_steps(self, test_steps: List[Dict[str, Any]]):
         """Analyze test steps and auto-generate reusable functions"""
         patterns_found = {}
+        function_cache = self.function_cache
         
-        for step in test_steps:
-            # Analyze step patterns and generate function names
-            function_name = self._generate_function_name(step)
+        # Analyze step patterns and generate function names, classifying each
+        # distinct step signature once since suites repeat the same steps heavily
+        signatures = [_step_signature(step) for step in test_steps]
+        names = {signature: _classify(*signature) for signature in dict.fromkeys(signatures)}
+        
+        for step, signature in zip(test_steps, signatures):
+            function_name = names[signature]
             
             if function_name:
                 # Check if we already have this function
-                if function_name not in self.function_cache:
+                if function_name not in function_cache:
                     function_def = self._create_function_definition(step, function_name)
-                    self.function_cache[function_name] = function_def
+                    function_cache[function_name] = function_def
                     patterns_found[function_name] = function_def
                 
                 # Replace step with function call
@@ -50,151 +236,55 @@ class FunctionGenerator:
         
         # Save updated function cache
         if patterns_found:
-            save_json_safely(self.function_cache, self.function_cache_path)
+            self._dirty = True
+            self.flush()
             logger.info(f"Generated {len(patterns_found)} new functions")
         
         return patterns_found
     
+    def _mark_dirty(self):
+        """Record a cache change, writing it out at most once per flush interval"""
+        self._dirty = True
+        if time.monotonic() - self._last_flush > _FLUSH_INTERVAL:
+            self.flush()
+    
+    def flush(self):
+        """Write the function cache to disk if it has unsaved changes"""
+        if not self._dirty:
+            return
+        # Merge with the file so generators sharing it (e.g. parallel workers)
+        # keep each other's functions; this generator's entries win
+        with self._save_lock:
+            merged = load_json_safely(self.function_cache_path) if os.path.exists(self.function_cache_path) else {}
+            merged.update(self.function_cache)
+            if save_json_safely(merged, self.function_cache_path):
+                self.function_cache.update(merged)
+                self._dirty = False
+        self._last_flush = time.monotonic()
+    
     def _generate_function_name(self, step: Dict[str, Any]) -> str:
         """Generate function name based on step pattern"""
-        action = step.get('action', '').lower()
-        description = step.get('description', '')
-        locator_value = step.get('locator_value', '')
-        expected = step.get('expected', '')
-        
-        # Pattern 1: Verify actions -> verify[ScreenName]Displayed()
-        if action in ['verify', 'assert', 'validate']:
-            if 'screen' in description.lower() or 'page' in description.lower() or 'displayed' in description.lower():
-                screen_name = self._extract_screen_name(description, locator_value, expected)
-                if screen_name:
-                    return f"verify{screen_name}Displayed"
-            
-            elif 'button' in description.lower() or 'element' in description.lower():
-                element_name = self._extract_element_name(description, locator_value)
-                if element_name:
-                    return f"verify{element_name}Visible"
-            
-            elif expected:
-                element_name = self._extract_element_name(description, expected)
-                if element_name:
-                    return f"verify{element_name}Text"
-        
-        # Pattern 2: Click actions -> click[ElementName]()
-        elif action in ['click', 'tap']:
-            element_name = self._extract_element_name(description, locator_value)
-            if element_name:
-                if 'button' in description.lower():
-                    return f"click{element_name}Button"
-                elif 'tab' in description.lower():
-                    return f"click{element_name}Tab"
-                else:
-                    return f"click{element_name}"
-        
-        # Pattern 3: Input actions -> enter[FieldName]()
-        elif action in ['type', 'enter', 'input']:
-            field_name = self._extract_element_name(description, locator_value)
-            if field_name:
-                return f"enter{field_name}"
-        
-        # Pattern 4: Navigation -> navigateTo[ScreenName]()
-        elif action in ['navigate', 'goto']:
-            screen_name = self._extract_screen_name(description, locator_value, expected)
-            if screen_name:
-                return f"navigateTo{screen_name}"
-        
-        # Pattern 5: Wait actions -> waitFor[ScreenName]()
-        elif action == 'wait' and ('screen' in description.lower() or 'page' in description.lower()):
-            screen_name = self._extract_screen_name(description, locator_value, expected)
-            if screen_name:
-                return f"waitFor{screen_name}"
-        
-        return ""
+        return _classify(*_step_signature(step))
     
     def _extract_screen_name(self, description: str, locator_value: str, expected: str) -> str:
         """Extract screen name from various sources"""
-        # Priority: expected result > description > locator
-        text_sources = [expected, description, locator_value]
-        
-        for text in text_sources:
-            if not text:
-                continue
-            
-            # Look for screen/page patterns
-            patterns = [
-                r'(\w+)\s*screen',
-                r'(\w+)\s*page',
-                r'(\w+)\s*dashboard',
-                r'(\w+)\s*menu',
-                r'manage\s*(\w+)',
-                r'(\w+)\s*billing',
-                r'(\w+)\s*payment',
-                r'(\w+)\s*confirmation'
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, text.lower())
-                if match:
-                    screen_name = match.group(1).title()
-                    return screen_name
-        
-        return ""
+        return _extract_screen_name(description, locator_value, expected)
     
     def _extract_element_name(self, description: str, locator_value: str) -> str:
         """Extract element name from description or locator"""
-        text_sources = [description, locator_value]
-        
-        for text in text_sources:
-            if not text:
-                continue
-            
-            # Look for element patterns
-            patterns = [
-                r'(\w+)\s*button',
-                r'(\w+)\s*tab',
-                r'(\w+)\s*field',
-                r'(\w+)\s*input',
-                r'submit',
-                r'continue',
-                r'next',
-                r'back',
-                r'edit',
-                r'save',
-                r'settings',
-                r'alerts'
-            ]
-            
-            for pattern in patterns:
-                if pattern in ['submit', 'continue', 'next', 'back', 'edit', 'save', 'settings', 'alerts']:
-                    if pattern in text.lower():
-                        return pattern.title()
-                else:
-                    match = re.search(pattern, text.lower())
-                    if match:
-                        return match.group(1).title()
-        
-        # Extract from locator ID
-        if 'id/' in locator_value:
-            id_part = locator_value.split('id/')[-1]
-            # Convert snake_case or camelCase to TitleCase
-            if '_' in id_part:
-                return ''.join(word.title() for word in id_part.split('_'))
-            elif any(c.isupper() for c in id_part[1:]):
-                # camelCase - capitalize first letter
-                return id_part[0].upper() + id_part[1:]
-        
-        return ""
+        return _extract_element_name(description, locator_value)
     
     def _create_function_definition(self, step: Dict[str, Any], function_name: str) -> Dict[str, Any]:
         """Create function definition from step"""
         return {
             'name': function_name,
             'action': step.get('action'),
-            'locator_type': step.get('locator_type'),
-            'locator_value': step.get('locator_value'),
-            'test_data': step.get('test_data'),
-            'expected': step.get('expected'),
+            'locator_type': step.get('locator_type', ''),
+            'locator_value': step.get('locator_value', ''),
+            'test_data': step.get('test_data', ''),
+            'expected': step.get('expected', ''),
             'wait_time': step.get('wait_time', 0),
-            'description': step.get('description'),
+            'description': step.get('description', ''),
             'generated_from': 'excel_pattern',
             'usage_count': 0,
             'parameters': self._extract_parameters(step)
@@ -208,26 +298,27 @@ class FunctionGenerator:
         expected = step.get('expected', '')
         
         # Look for variable patterns
-        if '{' in test_data or '$' in test_data:
+        if _PARAM_CHAR_RE.search(test_data):
             parameters.append('test_data')
         
-        if '{' in expected or '$' in expected:
+        if _PARAM_CHAR_RE.search(expected):
             parameters.append('expected_value')
         
         return parameters
     
     def execute_function(self, function_name: str, **kwargs) -> Dict[str, Any]:
         """Execute a generated function"""
-        if function_name not in self.function_cache:
+        func_def = self.function_cache.get(function_name)
+        if func_def is None:
             return {
                 'status': 'fail',
                 'message': f'Function not found: {function_name}'
             }
         
-        func_def = self.function_cache[function_name]
         
         # Update usage count
         func_def['usage_count'] = func_def.get('usage_count', 0) + 1
+        self._mark_dirty()
         
         # Build step from function definition
         step = {
@@ -264,17 +355,15 @@ class FunctionGenerator:
         return {
             'functions': self.function_cache,
             'total_functions': len(self.function_cache),
-            'most_used': sorted(
+            'most_used': heapq.nlargest(
+                10,
                 self.function_cache.items(), 
-                key=lambda x: x[1].get('usage_count', 0), 
-                reverse=True
-            )[:10]
+                key=lambda x: x[1].get('usage_count', 0)
+            )
         }
     
     def generate_function_documentation(self) -> str:
         """Generate documentation for all functions"""
-        doc = "# Auto-Generated Function Library\\n\\n"
-        
         categories = {
             'verify': 'Verification Functions',
             'click': 'Click/Tap Functions',
@@ -282,22 +371,30 @@ class FunctionGenerator:
             'navigate': 'Navigation Functions',
             'wait': 'Wait Functions'
         }
+        prefix_len = max(map(len, categories))
+        
+        # Single pass over the cache; the category prefixes are mutually exclusive
+        buckets = {category: [] for category in categories}
+        for name, func in self.function_cache.items():
+            head = name[:prefix_len].lower()
+            for category, functions in buckets.items():
+                if head.startswith(category):
+                    functions.append((name, func))
+                    break
         
+        parts = ["# Auto-Generated Function Library\\n\\n"]
         for category, title in categories.items():
-            functions = [
-                (name, func) for name, func in self.function_cache.items()
-                if name.lower().startswith(category)
-            ]
+            functions = buckets[category]
             
             if functions:
-                doc += f"## {title}\\n\\n"
+                parts.append(f"## {title}\\n\\n")
                 for name, func in functions:
-                    doc += f"### `{name}()`\\n"
-                    doc += f"- **Action**: {func['action']}\\n"
-                    doc += f"- **Description**: {func['description']}\\n"
-                    doc += f"- **Usage Count**: {func.get('usage_count', 0)}\\n"
+                    parts.append(f"### `{name}()`\\n")
+                    parts.append(f"- **Action**: {func['action']}\\n")
+                    parts.append(f"- **Description**: {func['description']}\\n")
+                    parts.append(f"- **Usage Count**: {func.get('usage_count', 0)}\\n")
                     if func.get('parameters'):
-                        doc += f"- **Parameters**: {', '.join(func['parameters'])}\\n"
-                    doc += "\\n"
+                        parts.append(f"- **Parameters**: {', '.join(func['parameters'])}\\n")
+                    parts.append("\\n")
         
-        return doc
\ No newline at end of file
+        return ''.join(parts)
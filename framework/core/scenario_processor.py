@@ -2,14 +2,50 @@
 Scenario Processor - Handles business scenario to technical steps mapping
 """
 
+import hashlib
 import logging
 import json
 import os
+import pickle
+import re
 from typing import Dict, List, Any
-import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Parsed Excel libraries are cached here, keyed by workbook path, mtime and size
+_LIBRARY_CACHE_DIR = os.path.join('cache', 'scenario_libraries')
+# Bump whenever _parse_excel_library's output changes, so older caches are re-parsed
+_LIBRARY_CACHE_VERSION = 1
+
+# Padding for technical step lines with fewer than the five pipe-separated fields
+_EMPTY_STEP_FIELDS = [''] * 5
+
+# Template placeholders and the scenario data column each one is filled from
+_PARAM_COLUMNS = {
+    'username': 'Username',
+    'password': 'Password',
+    'test_data': 'Test Data',
+    'phone': 'Phone',
+    'email': 'Email'
+}
+_PARAM_RE = re.compile(r'\{(%s)\}' % '|'.join(_PARAM_COLUMNS))
+
+
+def _make_substituter(data):
+    """Build a placeholder substitution function bound to one scenario's data"""
+    values = {name: str(data.get(column, '')) for name, column in _PARAM_COLUMNS.items()}
+    
+    def replace(match):
+        return values[match.group(1)]
+    
+    def substitute(text):
+        # Most template fields carry no placeholder at all; skip the regex for them
+        if not text or not isinstance(text, str) or '{' not in text:
+            return text
+        return _PARAM_RE.sub(replace, text)
+    
+    return substitute
+
 
 class ScenarioProcessor:
     """Converts business scenarios to technical test steps"""
@@ -47,74 +83,130 @@ class ScenarioProcessor:
             self.step_templates = data.get('step_templates', {})
     
     def _load_excel_library(self, excel_path):
-        """Load scenarios from Excel file with multiple sheets"""
+        """Load scenarios from Excel file, reusing the parsed cache while the file is unchanged"""
+        source = os.path.abspath(excel_path)
+        cache_name = hashlib.blake2b(source.encode(), digest_size=16).hexdigest() + '.pkl'
+        cache_path = os.path.join(_LIBRARY_CACHE_DIR, cache_name)
+        stat = os.stat(excel_path)
+        stamp = (_LIBRARY_CACHE_VERSION, source, stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._read_library_cache(cache_path, stamp)
+        if cached is None:
+            scenarios, templates = self._parse_excel_library(excel_path)
+            self._write_library_cache(cache_path, (stamp, scenarios, templates))
+        else:
+            scenarios, templates = cached
+        
+        self.scenario_library.update(scenarios)
+        self.step_templates.update(templates)
+    
+    def _read_library_cache(self, cache_path, stamp):
+        """Return cached (scenarios, templates) if the cache matches the workbook stamp"""
+        if not os.path.exists(cache_path):
+            return None
         try:
-            # Load scenarios sheet
-            scenarios_df = pd.read_excel(excel_path, sheet_name='Scenarios')
-            scenarios_df = scenarios_df.fillna('')
-            
-            for _, row in scenarios_df.iterrows():
-                scenario_name = str(row.get('Scenario Name', '')).strip()
-                if not scenario_name:
-                    continue
-                
-                # Parse step sequence
-                steps_str = str(row.get('Steps', ''))
-                steps = [step.strip() for step in steps_str.split('|') if step.strip()]
-                
-                self.scenario_library[scenario_name] = {
-                    'description': str(row.get('Description', '')),
-                    'steps': steps,
-                    'preconditions': str(row.get('Preconditions', '')),
-                    'expected_outcome': str(row.get('Expected Outcome', '')),
-                    'data_requirements': str(row.get('Data Requirements', ''))
-                }
-            
-            # Load step templates sheet
-            try:
-                templates_df = pd.read_excel(excel_path, sheet_name='StepTemplates')
-                templates_df = templates_df.fillna('')
+            with open(cache_path, 'rb') as f:
+                cached_stamp, scenarios, templates = pickle.load(f)
+            if cached_stamp != stamp:
+                return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable scenario library cache {cache_path}: {e}")
+            return None
+        return scenarios, templates
+    
+    def _write_library_cache(self, cache_path, payload):
+        """Persist the parsed library; failures only cost the next load a re-parse"""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.debug(f"Could not write scenario library cache {cache_path}: {e}")
+    
+    def _parse_excel_library(self, excel_path):
+        """Parse scenarios and step templates from Excel file with multiple sheets"""
+        import pandas as pd
+        
+        scenario_library = {}
+        step_templates = {}
+        try:
+            # Open the workbook once for both sheets
+            with pd.ExcelFile(excel_path) as workbook:
+                # Load scenarios sheet
+                scenarios_df = workbook.parse('Scenarios')
+                scenarios_df = scenarios_df.fillna('')
                 
-                for _, row in templates_df.iterrows():
-                    template_name = str(row.get('Template Name', '')).strip()
-                    if not template_name:
+                # Plain dict records avoid building a Series per row
+                for row in scenarios_df.to_dict('records'):
+                    scenario_name = str(row.get('Scenario Name', '')).strip()
+                    if not scenario_name:
                         continue
                     
-                    # Parse technical steps
-                    tech_steps_str = str(row.get('Technical Steps', ''))
-                    tech_steps = []
-                    
-                    if tech_steps_str:
-                        # Split by newline - handle both \\n and actual newlines  
-                        raw_steps = tech_steps_str.replace('\\n', '\n').split('\n')
-                        for step in raw_steps:
-                            step = step.strip()
-                            if step and '|' in step:
-                                # Parse step format: action|locator_type|locator_value|test_data
-                                parts = [p.strip() for p in step.split('|')]
-                                if len(parts) >= 1:
-                                    tech_steps.append({
-                                        'action': parts[0],
-                                        'locator_type': parts[1] if len(parts) > 1 else '',
-                                        'locator_value': parts[2] if len(parts) > 2 else '',
-                                        'test_data': parts[3] if len(parts) > 3 else '',
-                                        'description': parts[4] if len(parts) > 4 else f"Execute {parts[0]} action",
-                                        'screenshot': parts[0] == 'screenshot',
-                                        'wait_time': 3 if parts[0] == 'wait' else 0
-                                    })
+                    # Parse step sequence
+                    steps_str = str(row.get('Steps', ''))
+                    steps = [step for step in map(str.strip, steps_str.split('|')) if step]
                     
-                    self.step_templates[template_name] = {
+                    scenario_library[scenario_name] = {
                         'description': str(row.get('Description', '')),
-                        'technical_steps': tech_steps,
-                        'parameters': str(row.get('Parameters', '')).split(',') if row.get('Parameters') else []
+                        'steps': steps,
+                        'preconditions': str(row.get('Preconditions', '')),
+                        'expected_outcome': str(row.get('Expected Outcome', '')),
+                        'data_requirements': str(row.get('Data Requirements', ''))
                     }
+                
+                # Load step templates sheet
+                try:
+                    templates_df = workbook.parse('StepTemplates')
+                    templates_df = templates_df.fillna('')
                     
-            except Exception as e:
-                logger.warning(f"No step templates sheet found or error reading it: {e}")
+                    for row in templates_df.to_dict('records'):
+                        template_name = str(row.get('Template Name', '')).strip()
+                        if not template_name:
+                            continue
+                        
+                        # Parse technical steps
+                        tech_steps_str = str(row.get('Technical Steps', ''))
+                        tech_steps = []
+                        append_step = tech_steps.append
+                        
+                        if tech_steps_str:
+                            # Split by newline - handle both \\n and actual newlines  
+                            raw_steps = tech_steps_str.replace('\\n', '\n').split('\n')
+                            for step in raw_steps:
+                                step = step.strip()
+                                if step and '|' in step:
+                                    # Parse step format: action|locator_type|locator_value|test_data|description
+                                    # The description is the last field and may itself contain '|'
+                                    parts = step.split('|', 4)
+                                    has_description = len(parts) == 5
+                                    action, locator_type, locator_value, test_data, description = map(
+                                        str.strip, parts + _EMPTY_STEP_FIELDS[len(parts):])
+                                    append_step({
+                                        'action': action,
+                                        'locator_type': locator_type,
+                                        'locator_value': locator_value,
+                                        'test_data': test_data,
+                                        'description': description if has_description else f"Execute {action} action",
+                                        'screenshot': action == 'screenshot',
+                                        'wait_time': 3 if action == 'wait' else 0
+                                    })
+                        
+                        step_templates[template_name] = {
+                            'description': str(row.get('Description', '')),
+                            'technical_steps': tech_steps,
+                            'parameters': str(row.get('Parameters', '')).split(',') if row.get('Parameters') else []
+                        }
+                        
+                except Exception as e:
+                    logger.warning(f"No step templates sheet found or error reading it: {e}")
             
         except Exception as e:
             logger.error(f"Error loading Excel library: {str(e)}")
             raise
+        
+        return scenario_library, step_templates
     
     def process_business_scenarios(self, scenarios_data):
         """Convert business scenario data to technical test steps"""
@@ -156,6 +248,8 @@ class ScenarioProcessor:
     def _expand_scenario_steps(self, scenario_def, scenario_data):
         """Expand a business scenario into technical steps"""
         technical_steps = []
+        substitute = _make_substituter(scenario_data)
+        expected = substitute(scenario_def.get('expected_outcome', ''))
         
         for step_template_name in scenario_def.get('steps', []):
             if step_template_name in self.step_templates:
@@ -165,12 +259,12 @@ class ScenarioProcessor:
                 for tech_step in template.get('technical_steps', []):
                     step = {
                         'step_no': len(technical_steps) + 1,
-                        'description': self._substitute_parameters(tech_step.get('description', ''), scenario_data),
+                        'description': substitute(tech_step.get('description', '')),
                         'action': tech_step.get('action', ''),
                         'locator_type': tech_step.get('locator_type', ''),
-                        'locator_value': self._substitute_parameters(tech_step.get('locator_value', ''), scenario_data),
-                        'test_data': self._substitute_parameters(tech_step.get('test_data', ''), scenario_data),
-                        'expected': self._substitute_parameters(scenario_def.get('expected_outcome', ''), scenario_data),
+                        'locator_value': substitute(tech_step.get('locator_value', '')),
+                        'test_data': substitute(tech_step.get('test_data', '')),
+                        'expected': expected,
                         'screenshot': tech_step.get('screenshot', False),
                         'optional': False,
                         'on_fail': 'stop',
@@ -199,27 +293,15 @@ class ScenarioProcessor:
     
     def _substitute_parameters(self, text, data):
         """Substitute parameters in text with actual data"""
-        if not text or not isinstance(text, str):
+        if not text or not isinstance(text, str) or '{' not in text:
             return text
-        
-        # Replace common placeholders
-        replacements = {
-            '{username}': data.get('Username', ''),
-            '{password}': data.get('Password', ''),
-            '{test_data}': data.get('Test Data', ''),
-            '{phone}': data.get('Phone', ''),
-            '{email}': data.get('Email', '')
-        }
-        
-        result = text
-        for placeholder, value in replacements.items():
-            result = result.replace(placeholder, str(value))
-        
-        return result
+        return _make_substituter(data)(text)
     
     def create_scenario_library_template(self, output_path):
         """Create a template Excel file for scenario library"""
         try:
+            import pandas as pd
+            
             with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
                 
                 # Scenarios sheet
@@ -5,18 +5,155 @@ Uses AI/ML techniques to automatically recover from element identification failu
 """
 
 import json
+import os
 import pickle
 import logging
+import time
+import joblib
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.exceptions import NotFittedError
 from sklearn.metrics.pairwise import cosine_similarity
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 import difflib
+import math
 import re
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
+# Optional Intel oneDAL acceleration (scikit-learn-intelex), opt-in with TESTZEN_SKLEARNEX=1.
+# Its estimator is used directly instead of patching scikit-learn for the whole process.
+# A forest saved with it only unpickles where sklearnex is importable; elsewhere
+# load_model warns and starts from an untrained model.
+if os.environ.get('TESTZEN_SKLEARNEX') == '1':
+    try:
+        from sklearnex.ensemble import RandomForestClassifier
+    except ImportError:
+        logging.getLogger(__name__).warning("TESTZEN_SKLEARNEX is set but sklearnex is not installed")
+
+# Feature layout: hashed text tokens followed by the numerical signature features
+_TEXT_FEATURES = 128
+_NUMERIC_FEATURES = 5
+_FEATURE_DIM = _TEXT_FEATURES + _NUMERIC_FEATURES
+# Forests split on float32 internally, so storing that avoids a converted copy per fit/predict
+_FEATURE_DTYPE = np.float32
+# Stateless, so features are comparable across samples without fitting a vocabulary
+_TEXT_VECTORIZER = HashingVectorizer(n_features=_TEXT_FEATURES, alternate_sign=False, norm='l1')
+# Initial rows in the training sample buffer; it doubles when full
+_SAMPLE_CAPACITY = 256
+
+_HEALING_CACHE_SIZE = 1024
+# Seconds during which a locator that could not be healed is not retried
+_NEGATIVE_CACHE_TTL = 2.0
+
+# Separators that mark the dynamic suffix of an ID
+_ID_SEPARATORS = frozenset('_-:')
+_ID_SPLIT_RE = re.compile(r'[_\-:]')
+# Word separators in IDs/names, turned into spaces for text search
+_TO_SPACE = str.maketrans('_-', '  ')
+
+_BY_MAPPING = {
+    'id': By.ID,
+    'name': By.NAME,
+    'xpath': By.XPATH,
+    'css': By.CSS_SELECTOR,
+    'class': By.CLASS_NAME,
+    'tag': By.TAG_NAME
+}
+
+# New samples between automatic retrains
+_RETRAIN_INTERVAL = 100
+
+# Forest sizing: initial trees, trees added per incremental retrain, and the cap
+# at which the forest is rebuilt from scratch
+_BASE_ESTIMATORS = 30
+_RETRAIN_ESTIMATORS = 10
+_MAX_ESTIMATORS = 100
+
+# Candidate elements considered by the AI strategy, and how to query them
+# (CSS for the batched script, XPath for the per-element fallback)
+_AI_CANDIDATE_LIMIT = 50
+_CANDIDATE_QUERIES = {
+    'id': ('[id]', "//*[@id]"),
+    'class': ('[class]', "//*[@class]"),
+    None: ('*', "//*")
+}
+_CANDIDATE_SCRIPT = (
+    "return Array.from(document.querySelectorAll(arguments[0])).slice(0, arguments[1])"
+    ".map(e => [e.id || '', e.getAttribute('class') || '', e.innerText || '']);"
+)
+
+# Sibling count read straight from the DOM, one round trip per element
+_SIBLING_COUNT_SCRIPT = "return arguments[0].parentNode ? arguments[0].parentNode.childElementCount : 0;"
+
+# Character n-gram profiles for text similarity; rows are L2-normalised so cosine is a dot product
+_NGRAM_VECTORIZER = HashingVectorizer(analyzer='char_wb', ngram_range=(2, 3), n_features=2 ** 18,
+                                      alternate_sign=False)
+# Below this length n-gram profiles carry too little signal; difflib is used instead
+_MIN_NGRAM_TEXT = 3
+
+@lru_cache(maxsize=1024)
+def _char_ngram_profile(text: str) -> Tuple[Counter, float]:
+    """Character 2-3-gram counts of text (as _NGRAM_VECTORIZER analyses it) and their L2 norm"""
+    counts = Counter()
+    for word in text.lower().split():
+        word = f' {word} '
+        counts.update(word[i:i + 2] for i in range(len(word) - 1))
+        counts.update(word[i:i + 3] for i in range(len(word) - 2))
+    return counts, math.sqrt(sum(count * count for count in counts.values()))
+
+def _ngram_cosine(text1: str, text2: str) -> float:
+    """Cosine similarity of two texts' character n-gram profiles"""
+    counts1, norm1 = _char_ngram_profile(text1)
+    counts2, norm2 = _char_ngram_profile(text2)
+    if not norm1 or not norm2:
+        return 0.0
+    if len(counts1) > len(counts2):
+        counts1, counts2 = counts2, counts1
+    return sum(count * counts2[gram] for gram, count in counts1.items()) / (norm1 * norm2)
+
+def _signature_key(signature: 'ElementSignature') -> tuple:
+    """Hashable view of the signature fields that feed the feature vector"""
+    return (
+        signature.locator_value,
+        signature.text,
+        signature.tag_name,
+        tuple(signature.attributes.values()),
+        signature.siblings_count,
+        signature.position,
+        bool(signature.parent_signature)
+    )
+
+@lru_cache(maxsize=4096)
+def _signature_features(key: tuple) -> np.ndarray:
+    """Feature vector for a signature key; cached since the same elements recur"""
+    locator_value, text, tag_name, attribute_values, siblings_count, position, has_parent = key
+    features = np.empty(_FEATURE_DIM, dtype=_FEATURE_DTYPE)
+
+    # Text-based features
+    text_features = [locator_value, text, tag_name, ' '.join(attribute_values)]
+    features[:_TEXT_FEATURES] = _TEXT_VECTORIZER.transform([' '.join(text_features)]).toarray()[0]
+
+    # Numerical features
+    features[_TEXT_FEATURES:] = (
+        len(locator_value),
+        siblings_count,
+        position,
+        len(attribute_values),
+        1 if has_parent else 0
+    )
+
+    features.setflags(write=False)
+    return features
+
 @dataclass
 class ElementSignature:
     """Unique signature of an element for identification"""
@@ -43,109 +180,164 @@ class ElementLearner:
 
     def __init__(self, model_path: str = "models/element_patterns.pkl"):
         self.model_path = Path(model_path)
-        self.vectorizer = TfidfVectorizer(max_features=100)
-        self.classifier = RandomForestClassifier(n_estimators=100)
-        self.element_history = {}
+        self.classifier = self._new_classifier()
+        # Interaction history as parallel per-sample arrays; rows [0, _n) are filled
+        self._X = np.empty((_SAMPLE_CAPACITY, _FEATURE_DIM), dtype=_FEATURE_DTYPE)
+        self._y = np.empty(_SAMPLE_CAPACITY, dtype=np.uint8)
+        self._timestamps = np.empty(_SAMPLE_CAPACITY)
+        self._element_ids = []
+        self._id_to_idx = {}
+        self._n = 0
+        self._samples_since_fit = 0
         self.logger = logging.getLogger(__name__)
         self.load_model()
 
     def learn_element(self, element_id: str, signature: ElementSignature, success: bool):
         """Learn from element interaction success/failure"""
-        features = self._extract_features(signature)
-
-        if element_id not in self.element_history:
-            self.element_history[element_id] = []
-
-        self.element_history[element_id].append({
-            'signature': signature,
-            'features': features,
-            'success': success,
-            'timestamp': time.time()
-        })
-
-        # Retrain model periodically
-        if len(self.element_history) % 100 == 0:
-            self._retrain_model()
+        self._append_sample(element_id, self._extract_features(signature), success, time.time())
+        self._samples_since_fit += 1
+
+        # Retrain model every _RETRAIN_INTERVAL new samples, once both outcomes have been seen
+        # (a single-class forest cannot produce a success probability)
+        if self._samples_since_fit >= _RETRAIN_INTERVAL:
+            labels = self._y[:self._n]
+            if labels.min() != labels.max():
+                self._retrain_model()
+                self._samples_since_fit = 0
+
+    def _append_sample(self, element_id: str, features: np.ndarray, success: bool, timestamp: float):
+        """Store a training sample, doubling the buffers when they are full"""
+        row = self._n
+        if row == len(self._y):
+            self._reserve(2 * row)
+        self._X[row] = features
+        self._y[row] = 1 if success else 0
+        self._timestamps[row] = timestamp
+        self._element_ids.append(element_id)
+        self._id_to_idx.setdefault(element_id, []).append(row)
+        self._n = row + 1
+
+    def _reserve(self, capacity: int):
+        """Grow the sample buffers to hold at least capacity rows"""
+        if capacity <= len(self._y):
+            return
+        n = self._n
+        X = np.empty((capacity, _FEATURE_DIM), dtype=self._X.dtype)
+        X[:n] = self._X[:n]
+        y = np.empty(capacity, dtype=self._y.dtype)
+        y[:n] = self._y[:n]
+        timestamps = np.empty(capacity)
+        timestamps[:n] = self._timestamps[:n]
+        self._X, self._y, self._timestamps = X, y, timestamps
 
     def _extract_features(self, signature: ElementSignature) -> np.ndarray:
-        """Extract ML features from element signature"""
-        features = []
-
-        # Text-based features
-        text_features = [
-            signature.locator_value,
-            signature.text,
-            signature.tag_name,
-            ' '.join(signature.attributes.values())
-        ]
-        text_vector = self.vectorizer.fit_transform([' '.join(text_features)])
-
-        # Numerical features
-        numerical_features = [
-            len(signature.locator_value),
-            signature.siblings_count,
-            signature.position,
-            len(signature.attributes),
-            1 if signature.parent_signature else 0
-        ]
-
-        # Combine features
-        combined = np.hstack([text_vector.toarray()[0], numerical_features])
-        return combined
-
-    def _retrain_model(self):
-        """Retrain ML model with accumulated data"""
-        X = []
-        y = []
-
-        for element_data_list in self.element_history.values():
-            for data in element_data_list:
-                X.append(data['features'])
-                y.append(1 if data['success'] else 0)
-
-        if len(X) > 10:
-            self.classifier.fit(X, y)
+        """Extract ML features from element signature (read-only, shared between calls)"""
+        return _signature_features(_signature_key(signature))
+
+    @staticmethod
+    def _new_classifier() -> RandomForestClassifier:
+        # Small, shallow forest: the success/failure signal is simple and the model
+        # is queried on every healing attempt; warm_start lets retrains add trees
+        return RandomForestClassifier(
+            n_estimators=_BASE_ESTIMATORS,
+            max_depth=12,
+            max_features='sqrt',
+            n_jobs=-1,
+            warm_start=True
+        )
+
+    def _retrain_model(self, force: bool = False):
+        """Retrain ML model with accumulated data
+
+        An already fitted forest is extended with a few trees trained on the current
+        data; a full refit happens when forced or once the forest reaches its cap.
+        """
+        if self._n > 10:
+            fitted = hasattr(self.classifier, 'estimators_')
+            if force or not fitted or self.classifier.n_estimators >= _MAX_ESTIMATORS:
+                self.classifier = self._new_classifier()
+            else:
+                self.classifier.n_estimators += _RETRAIN_ESTIMATORS
+            self.classifier.fit(self._X[:self._n], self._y[:self._n])
             self.save_model()
 
     def predict_success(self, signature: ElementSignature) -> float:
         """Predict likelihood of successful element identification"""
         features = self._extract_features(signature)
         try:
-            probability = self.classifier.predict_proba([features])[0][1]
-            return probability
-        except:
+            probabilities = self.classifier.predict_proba(features.reshape(1, -1))
+        except NotFittedError:
             return 0.5  # Default probability if model not trained
+        if probabilities.shape[1] < 2:
+            return 0.5  # Model only ever saw one outcome
+        return float(probabilities[0, 1])
 
     def save_model(self):
         """Save trained model to disk"""
         self.model_path.parent.mkdir(parents=True, exist_ok=True)
-        model_data = {
-            'vectorizer': self.vectorizer,
-            'classifier': self.classifier,
-            'history': self.element_history
+        # Uncompressed so the forest's arrays can be memory-mapped on load;
+        # the frequently changing history lives in its own file. The model is
+        # written beside the target and swapped in, since the current file may
+        # still be mapped by this (or another) process.
+        tmp_path = self.model_path.with_name(self.model_path.name + '.tmp')
+        joblib.dump(self.classifier, tmp_path)
+        os.replace(tmp_path, self.model_path)
+        history = {
+            'features': self._X[:self._n],
+            'labels': self._y[:self._n],
+            'timestamps': self._timestamps[:self._n],
+            'element_ids': self._element_ids
         }
-        with open(self.model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+        with open(self._history_path, 'wb') as f:
+            pickle.dump(history, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     def load_model(self):
         """Load trained model from disk"""
         if self.model_path.exists():
             try:
-                with open(self.model_path, 'rb') as f:
-                    model_data = pickle.load(f)
-                    self.vectorizer = model_data['vectorizer']
-                    self.classifier = model_data['classifier']
-                    self.element_history = model_data['history']
+                model_data = joblib.load(self.model_path, mmap_mode='r')
+                if isinstance(model_data, dict):
+                    # Pickled {vectorizer, classifier, history} from earlier versions;
+                    # its per-sample TF-IDF features are not compatible
+                    self.logger.info("Discarding element model with outdated features")
+                    return
+                self.classifier = model_data
+                if self._history_path.exists():
+                    with open(self._history_path, 'rb') as f:
+                        self._restore_history(pickle.load(f))
             except Exception as e:
                 self.logger.warning(f"Could not load model: {e}")
 
+    def _restore_history(self, history: Dict[str, Any]):
+        """Load saved samples into the sample buffers"""
+        features, labels = history['features'], history['labels']
+        n = len(labels)
+        self._reserve(n)
+        self._X[:n] = features
+        self._y[:n] = labels
+        self._timestamps[:n] = history['timestamps']
+        self._element_ids = list(history['element_ids'])
+        self._id_to_idx = {}
+        for row, element_id in enumerate(self._element_ids):
+            self._id_to_idx.setdefault(element_id, []).append(row)
+        self._n = n
+
+    @property
+    def _history_path(self) -> Path:
+        return self.model_path.with_name(f"{self.model_path.stem}_history.pkl")
+
 class SelfHealingEngine:
     """Main self-healing engine for automatic recovery"""
 
-    def __init__(self, driver):
+    def __init__(self, driver, cache_size: int = _HEALING_CACHE_SIZE):
         self.driver = driver
         self.element_learner = ElementLearner()
-        self.healing_cache = {}
+        self.healing_cache = OrderedDict()
+        self.cache_size = cache_size
+        self.negative_ttl = _NEGATIVE_CACHE_TTL
+        self._negative_cache = OrderedDict()
+        # Session implicit wait, read once on first use (DriverManager sets it at startup)
+        self._implicit_wait = None
         self.logger = logging.getLogger(__name__)
         self.healing_strategies = [
             self._try_partial_match,
@@ -171,8 +363,8 @@ class SelfHealingEngine:
             self.logger.warning(f"Original locator failed: {e}")
 
         # Check healing cache
-        if element_id in self.healing_cache:
-            cached_strategy = self.healing_cache[element_id]
+        cached_strategy = self._cache_get(element_id)
+        if cached_strategy:
             try:
                 element = self._find_element_regular(
                     cached_strategy.new_locator_type,
@@ -181,42 +373,74 @@ class SelfHealingEngine:
                 )
                 self.logger.info(f"Healed using cached strategy: {cached_strategy.name}")
                 return element
-            except:
+            except WebDriverException:
                 pass
 
+        # Skip strategy generation for locators that just failed to heal
+        failed_at = self._negative_cache.get(element_id)
+        if failed_at is not None and time.monotonic() - failed_at < self.negative_ttl:
+            raise Exception(f"Could not heal element: {locator_type}={locator_value}")
+
         # Try healing strategies
         strategies = self._generate_healing_strategies(locator_type, locator_value)
 
-        for strategy in strategies:
-            try:
-                element = self._find_element_regular(
-                    strategy.new_locator_type,
-                    strategy.new_locator_value,
-                    timeout=3
-                )
-
-                # Validate healed element
-                if self._validate_healed_element(element, locator_value):
-                    self.logger.info(f"Successfully healed using: {strategy.name}")
-                    self.logger.info(f"New locator: {strategy.new_locator_type}={strategy.new_locator_value}")
-
-                    # Cache successful strategy
-                    self.healing_cache[element_id] = strategy
-
-                    # Learn from healing
-                    signature = self._create_element_signature(
-                        element,
+        # The original lookup has already waited for the page to settle, so
+        # candidate locators get a single lookup each, with the implicit wait
+        # suspended so a missing candidate fails immediately
+        with self._implicit_wait_suspended():
+            for strategy in strategies:
+                try:
+                    element = self._find_element_once(
                         strategy.new_locator_type,
                         strategy.new_locator_value
                     )
-                    self.element_learner.learn_element(element_id, signature, True)
 
-                    return element
-            except Exception as e:
-                continue
+                    # Validate healed element
+                    if self._validate_healed_element(element, locator_value):
+                        self.logger.info(f"Successfully healed using: {strategy.name}")
+                        self.logger.info(f"New locator: {strategy.new_locator_type}={strategy.new_locator_value}")
+
+                        # Cache successful strategy
+                        self._cache_put(element_id, strategy)
+                        self._negative_cache.pop(element_id, None)
+
+                        # Learn from healing
+                        signature = self._create_element_signature(
+                            element,
+                            strategy.new_locator_type,
+                            strategy.new_locator_value
+                        )
+                        self.element_learner.learn_element(element_id, signature, True)
+
+                        return element
+                except Exception as e:
+                    continue
 
+        self._negative_cache[element_id] = time.monotonic()
+        self._negative_cache.move_to_end(element_id)
+        if len(self._negative_cache) > self.cache_size:
+            self._negative_cache.popitem(last=False)
         raise Exception(f"Could not heal element: {locator_type}={locator_value}")
 
+    def clear_cache(self):
+        """Forget healed and unhealable locators, e.g. between test iterations"""
+        self.healing_cache.clear()
+        self._negative_cache.clear()
+
+    def _cache_get(self, element_id: str) -> Optional[HealingStrategy]:
+        """Return the cached strategy for an element, marking it recently used"""
+        strategy = self.healing_cache.get(element_id)
+        if strategy is not None:
+            self.healing_cache.move_to_end(element_id)
+        return strategy
+
+    def _cache_put(self, element_id: str, strategy: HealingStrategy):
+        """Cache a successful strategy, evicting the least recently used entry"""
+        self.healing_cache[element_id] = strategy
+        self.healing_cache.move_to_end(element_id)
+        if len(self.healing_cache) > self.cache_size:
+            self.healing_cache.popitem(last=False)
+
     def _generate_healing_strategies(self, locator_type: str, locator_value: str) -> List[HealingStrategy]:
         """Generate potential healing strategies"""
         strategies = []
@@ -235,25 +459,23 @@ class SelfHealingEngine:
 
     def _try_partial_match(self, locator_type: str, locator_value: str) -> Optional[HealingStrategy]:
         """Try partial matching for dynamic IDs"""
-        if locator_type == 'id' and any(char in locator_value for char in ['_', '-', ':']):
+        if locator_type == 'id' and not _ID_SEPARATORS.isdisjoint(locator_value):
             # Extract stable part of ID
-            parts = re.split(r'[_\-:]', locator_value)
-            if parts:
-                stable_part = parts[0]
-                return HealingStrategy(
-                    name="Partial ID Match",
-                    confidence=0.7,
-                    new_locator_type="xpath",
-                    new_locator_value=f"//*[starts-with(@id, '{stable_part}')]",
-                    reasoning="Dynamic ID detected, using partial match"
-                )
+            stable_part = _ID_SPLIT_RE.split(locator_value, maxsplit=1)[0]
+            return HealingStrategy(
+                name="Partial ID Match",
+                confidence=0.7,
+                new_locator_type="xpath",
+                new_locator_value=f"//*[starts-with(@id, '{stable_part}')]",
+                reasoning="Dynamic ID detected, using partial match"
+            )
         return None
 
     def _try_text_search(self, locator_type: str, locator_value: str) -> Optional[HealingStrategy]:
         """Try finding element by text content"""
         if locator_type in ['id', 'name', 'class']:
             # Convert ID/name to readable text
-            text = locator_value.replace('_', ' ').replace('-', ' ').title()
+            text = locator_value.translate(_TO_SPACE).title()
             return HealingStrategy(
                 name="Text Search",
                 confidence=0.6,
@@ -300,37 +522,25 @@ class SelfHealingEngine:
         """Use AI to predict best alternative locator"""
         # Get all elements of similar type
         try:
-            if locator_type == 'id':
-                all_elements = self.driver.find_elements_by_xpath("//*[@id]")
-            elif locator_type == 'class':
-                all_elements = self.driver.find_elements_by_xpath("//*[@class]")
-            else:
-                all_elements = self.driver.find_elements_by_xpath("//*")
+            candidates = self._collect_candidates(locator_type)
+
+            # Calculate all similarity scores in one matrix operation
+            scores = self._similarity_scores(locator_value, [
+                f"{element_id} {element_class} {element_text}"
+                for element_id, element_class, element_text in candidates
+            ])
 
             best_match = None
             best_score = 0
-
-            for element in all_elements[:50]:  # Limit to first 50 elements
-                try:
-                    element_id = element.get_attribute('id') or ''
-                    element_class = element.get_attribute('class') or ''
-                    element_text = element.text or ''
-
-                    # Calculate similarity score
-                    score = self._calculate_similarity(
-                        locator_value,
-                        f"{element_id} {element_class} {element_text}"
-                    )
-
-                    if score > best_score:
-                        best_score = score
-                        best_match = element
-                except:
-                    continue
+            if candidates:
+                best = int(scores.argmax())
+                if scores[best] > 0:
+                    best_match = candidates[best]
+                    best_score = float(scores[best])
 
             if best_match and best_score > 0.6:
                 # Generate new locator for best match
-                new_id = best_match.get_attribute('id')
+                new_id = best_match[0]
                 if new_id:
                     return HealingStrategy(
                         name="AI Prediction",
@@ -344,6 +554,28 @@ class SelfHealingEngine:
 
         return None
 
+    def _collect_candidates(self, locator_type: str) -> List[Tuple[str, str, str]]:
+        """Fetch (id, class, text) of candidate elements, in one script call when possible"""
+        css, xpath = _CANDIDATE_QUERIES.get(locator_type, _CANDIDATE_QUERIES[None])
+        try:
+            rows = self.driver.execute_script(_CANDIDATE_SCRIPT, css, _AI_CANDIDATE_LIMIT)
+            return [tuple(row) for row in rows]
+        except WebDriverException:
+            pass
+
+        # Native app contexts have no DOM to script against
+        candidates = []
+        for element in self.driver.find_elements(By.XPATH, xpath)[:_AI_CANDIDATE_LIMIT]:
+            try:
+                candidates.append((
+                    element.get_attribute('id') or '',
+                    element.get_attribute('class') or '',
+                    element.text or ''
+                ))
+            except WebDriverException:
+                continue
+        return candidates
+
     def _try_visual_recognition(self, locator_type: str, locator_value: str) -> Optional[HealingStrategy]:
         """Use visual recognition to find element"""
         # This would integrate with computer vision libraries
@@ -352,7 +584,16 @@ class SelfHealingEngine:
 
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate text similarity score"""
-        return difflib.SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+        if len(text1) < _MIN_NGRAM_TEXT or len(text2) < _MIN_NGRAM_TEXT:
+            return difflib.SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+        return _ngram_cosine(text1, text2)
+
+    def _similarity_scores(self, query: str, texts: List[str]) -> np.ndarray:
+        """Character n-gram cosine similarity of query against each text"""
+        if not texts:
+            return np.zeros(0)
+        query_vector = _NGRAM_VECTORIZER.transform([query])
+        return cosine_similarity(query_vector, _NGRAM_VECTORIZER.transform(texts)).ravel()
 
     def _validate_healed_element(self, element: Any, original_value: str) -> bool:
         """Validate that healed element is correct"""
@@ -374,28 +615,38 @@ class SelfHealingEngine:
 
             return True  # Accept if other validations pass
 
-        except:
+        except (AttributeError, WebDriverException, ValueError):
             return False
 
     def _find_element_regular(self, locator_type: str, locator_value: str, timeout: int = 10):
         """Regular element finding without healing"""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-
-        by_mapping = {
-            'id': By.ID,
-            'name': By.NAME,
-            'xpath': By.XPATH,
-            'css': By.CSS_SELECTOR,
-            'class': By.CLASS_NAME,
-            'tag': By.TAG_NAME
-        }
-
-        by = by_mapping.get(locator_type, By.ID)
+        by = _BY_MAPPING.get(locator_type, By.ID)
         wait = WebDriverWait(self.driver, timeout)
         return wait.until(EC.presence_of_element_located((by, locator_value)))
 
+    def _find_element_once(self, locator_type: str, locator_value: str):
+        """Single element lookup without polling"""
+        return self.driver.find_element(_BY_MAPPING.get(locator_type, By.ID), locator_value)
+
+    @contextmanager
+    def _implicit_wait_suspended(self):
+        """Drop the driver's implicit wait to 0 so a failed lookup returns immediately"""
+        if self._implicit_wait is None:
+            self._implicit_wait = self.driver.timeouts.implicit_wait
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(self._implicit_wait)
+
+    def _count_siblings(self, element: Any) -> int:
+        """Number of child elements of the element's parent"""
+        try:
+            return self.driver.execute_script(_SIBLING_COUNT_SCRIPT, element) or 0
+        except WebDriverException:
+            # Native app contexts have no DOM to script against
+            return len(element.find_elements(By.XPATH, "../*"))
+
     def _create_element_signature(self, element: Any, locator_type: str,
                                  locator_value: str) -> ElementSignature:
         """Create signature for element"""
@@ -412,10 +663,10 @@ class SelfHealingEngine:
                 attributes=attributes,
                 text=element.text or '',
                 tag_name=element.tag_name,
-                siblings_count=len(element.find_elements_by_xpath("..//*")),
+                siblings_count=self._count_siblings(element),
                 position=0
             )
-        except:
+        except (AttributeError, WebDriverException, ValueError):
             return ElementSignature(
                 locator_type=locator_type,
                 locator_value=locator_value,
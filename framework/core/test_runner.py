@@ -3,8 +3,11 @@ Test Runner - Main test execution engine
 """
 
 import logging
+import queue
+import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any
 from .driver_manager import DriverManager
@@ -22,6 +25,9 @@ from src.utils.excel_utils import ExcelManager
 
 logger = logging.getLogger(__name__)
 
+# Set once logging is configured, so later runners (e.g. parallel workers) don't open more log files
+_LOG_CONFIGURED = False
+
 
 class TestRunner:
     """Main test execution engine"""
@@ -37,6 +43,7 @@ class TestRunner:
         self.report_generator = None
         self.excel_manager = None
         self.test_results = []
+        self._results_lock = threading.Lock()
         self.current_test = None
         
     def setup(self):
@@ -65,10 +72,15 @@ class TestRunner:
             # Load locators if provided
             locator_file = self.config.get('locator_file')
             if locator_file:
-                if locator_file.endswith('.json'):
-                    self.locator_manager.load_from_json(locator_file)
-                elif locator_file.endswith(('.xlsx', '.xls')):
-                    self.locator_manager.load_from_excel(locator_file)
+                loaders = {
+                    '.json': self.locator_manager.load_from_json,
+                    '.xlsx': self.locator_manager.load_from_excel,
+                }
+                loader = loaders.get(os.path.splitext(locator_file)[1].lower())
+                if loader:
+                    loader(locator_file)
+                else:
+                    logger.warning(f"Unsupported locator file type: {locator_file}")
             
             # Initialize scenario processor
             self.scenario_processor = ScenarioProcessor()
@@ -95,6 +107,8 @@ class TestRunner:
     def execute_test_file(self, excel_file: str, sheet_name: str = 'TestCases') -> Dict[str, Any]:
         """Execute test cases from Excel file"""
         start_time = datetime.now()
+        # Durations come from the monotonic clock; wall-clock times are for the report only
+        started = time.monotonic()
         test_result = {
             'test_file': excel_file,
             'start_time': start_time,
@@ -106,6 +120,10 @@ class TestRunner:
             'skipped_steps': 0,
             'step_results': []
         }
+        # Excel status updates, written in one pass when the run ends
+        pending_status = []
+        # Step counters are kept in locals and stored on test_result when the run ends
+        passed_steps = failed_steps = skipped_steps = 0
         
         try:
             # Initialize Excel manager for status updates
@@ -152,41 +170,52 @@ class TestRunner:
             test_result['total_steps'] = len(test_steps)
             test_result['generated_functions'] = list(generated_functions.keys())
             
+            # Resolve each named locator once, ahead of the step loop
+            resolved = {}
+            if self.locator_manager:
+                locator_names = {step['locator_name'] for step in test_steps if step.get('locator_name')}
+                resolved = {name: self.locator_manager.get_locator(name) for name in locator_names}
+            action_handler = self.action_handler
+            excel_manager = self.excel_manager
+            inter_step_delay = self.config.get('inter_step_delay', 0)
+            step_results = test_result['step_results']
+            
             # Execute test steps
             for step_index, step in enumerate(test_steps, 1):
                 logger.info(f"Executing Step {step_index}: {step.get('description', step.get('action'))}")
                 
                 # Update locator information from locator manager if needed
-                if step.get('locator_name') and self.locator_manager:
-                    locator_info = self.locator_manager.get_locator(step['locator_name'])
-                    if locator_info:
-                        step['locator_type'] = locator_info.get('type', step.get('locator_type'))
-                        step['locator_value'] = locator_info.get('value', step.get('locator_value'))
+                locator_info = resolved.get(step.get('locator_name'))
+                if locator_info:
+                    step['locator_type'] = locator_info.get('type', step.get('locator_type'))
+                    step['locator_value'] = locator_info.get('value', step.get('locator_value'))
                 
                 # Set test data context if available
                 if data_sets:
                     # Use first data set by default or specific one if mentioned
                     data_set_name = step.get('data_set', 'default')
                     if data_set_name in data_sets and data_sets[data_set_name]:
-                        self.action_handler.set_test_data_context(data_sets[data_set_name][0])
+                        action_handler.set_test_data_context(data_sets[data_set_name][0])
                 
                 # Execute action
-                step_result = self.action_handler.execute_action(step)
+                step_result = action_handler.execute_action(step)
                 step_result['step_no'] = step_index
                 step_result['description'] = step.get('description', '')
                 step_result['action'] = step.get('action', '')
                 
+                status = step_result['status']
+                
                 # Update Excel status with colors
-                if self.excel_manager:
-                    excel_status = "PASSED" if step_result['status'] == 'pass' else "FAILED" if step_result['status'] == 'fail' else "SKIPPED"
+                if excel_manager:
+                    excel_status = "PASSED" if status == 'pass' else "FAILED" if status == 'fail' else "SKIPPED"
                     result_message = step_result.get('message', '')
-                    self.excel_manager.update_step_status(step_index - 1, excel_status, result_message)
+                    pending_status.append((step_index - 1, excel_status, result_message))
                 
                 # Update counters
-                if step_result['status'] == 'pass':
-                    test_result['passed_steps'] += 1
-                elif step_result['status'] == 'fail':
-                    test_result['failed_steps'] += 1
+                if status == 'pass':
+                    passed_steps += 1
+                elif status == 'fail':
+                    failed_steps += 1
                     
                     # Check if we should stop on failure
                     if step.get('on_fail', 'stop') == 'stop' and not step.get('optional', False):
@@ -194,17 +223,18 @@ class TestRunner:
                         logger.error(f"Test failed at step {step_index}")
                         break
                 else:
-                    test_result['skipped_steps'] += 1
+                    skipped_steps += 1
                 
-                test_result['step_results'].append(step_result)
+                step_results.append(step_result)
                 
-                # Small delay between steps
-                time.sleep(0.5)
+                # Optional pause between steps; element waits already handle readiness
+                if inter_step_delay:
+                    time.sleep(inter_step_delay)
             
             # Determine overall status
-            if test_result['failed_steps'] > 0:
+            if failed_steps > 0:
                 test_result['status'] = 'fail'
-            elif test_result['passed_steps'] == test_result['total_steps']:
+            elif passed_steps == test_result['total_steps']:
                 test_result['status'] = 'pass'
             else:
                 test_result['status'] = 'partial'
@@ -215,20 +245,33 @@ class TestRunner:
             test_result['message'] = str(e)
         
         finally:
+            test_result['passed_steps'] = passed_steps
+            test_result['failed_steps'] = failed_steps
+            test_result['skipped_steps'] = skipped_steps
+            
+            if pending_status:
+                self.excel_manager.apply_status_batch(pending_status)
+            
+            # Persist function usage counts recorded during this run
+            if self.function_generator:
+                self.function_generator.flush()
+            
             test_result['end_time'] = datetime.now()
-            test_result['duration'] = (test_result['end_time'] - start_time).total_seconds()
+            test_result['duration'] = time.monotonic() - started
             
             # Generate report
             if self.report_generator:
                 self.report_generator.generate_test_report(test_result)
             
-            self.test_results.append(test_result)
+            with self._results_lock:
+                self.test_results.append(test_result)
         
         return test_result
     
     def execute_test_suite(self, test_files: List[str]) -> Dict[str, Any]:
         """Execute multiple test files as a suite"""
         suite_start = datetime.now()
+        started = time.monotonic()
         suite_result = {
             'suite_name': self.config.get('suite_name', 'Test Suite'),
             'start_time': suite_start,
@@ -239,10 +282,17 @@ class TestRunner:
             'test_results': []
         }
         
-        for test_file in test_files:
-            logger.info(f"Executing test file: {test_file}")
-            test_result = self.execute_test_file(test_file)
-            
+        workers = min(self.config.get('parallel_workers', 1), len(test_files))
+        if workers > 1 and not self._workers_have_own_targets(workers):
+            logger.warning("parallel_workers needs a 'worker_overrides' entry giving each extra worker "
+                           "its own appium_server/device_name; running serially")
+            workers = 1
+        if workers > 1:
+            test_results = self._execute_parallel(test_files, workers)
+        else:
+            test_results = map(self._execute_suite_file, test_files)
+        
+        for test_result in test_results:
             if test_result['status'] == 'pass':
                 suite_result['passed_tests'] += 1
             else:
@@ -251,7 +301,7 @@ class TestRunner:
             suite_result['test_results'].append(test_result)
         
         suite_result['end_time'] = datetime.now()
-        suite_result['duration'] = (suite_result['end_time'] - suite_start).total_seconds()
+        suite_result['duration'] = time.monotonic() - started
         
         # Generate suite report
         if self.report_generator:
@@ -259,6 +309,57 @@ class TestRunner:
         
         return suite_result
     
+    def _execute_suite_file(self, test_file: str) -> Dict[str, Any]:
+        """Execute one test file of a suite"""
+        logger.info(f"Executing test file: {test_file}")
+        return self.execute_test_file(test_file)
+    
+    def _execute_parallel(self, test_files: List[str], workers: int) -> List[Dict[str, Any]]:
+        """Execute test files concurrently on this runner plus extra runners, each with its own driver"""
+        idle_runners = queue.Queue()
+        idle_runners.put(self)
+        extra_runners = []
+        
+        try:
+            for index in range(1, workers):
+                runner = TestRunner(self._worker_config(index))
+                runner.test_results = self.test_results
+                runner._results_lock = self._results_lock
+                extra_runners.append(runner)
+                if runner.setup():
+                    idle_runners.put(runner)
+                else:
+                    logger.warning(f"Parallel worker {index} failed to start, continuing without it")
+            
+            def run_file(test_file):
+                runner = idle_runners.get()
+                try:
+                    return runner._execute_suite_file(test_file)
+                finally:
+                    idle_runners.put(runner)
+            
+            # Workers spend their time waiting on the driver, so threads are enough
+            with ThreadPoolExecutor(max_workers=idle_runners.qsize()) as executor:
+                return list(executor.map(run_file, test_files))
+        
+        finally:
+            for runner in extra_runners:
+                runner.teardown()
+    
+    def _workers_have_own_targets(self, workers: int) -> bool:
+        """True when every worker would drive a distinct (appium_server, device_name) pair"""
+        configs = [self.config] + [self._worker_config(index) for index in range(1, workers)]
+        targets = {(config.get('appium_server'), config.get('device_name')) for config in configs}
+        return len(targets) == workers
+    
+    def _worker_config(self, index: int) -> Dict[str, Any]:
+        """Config for an extra parallel worker; 'worker_overrides' gives per-worker device/server settings"""
+        config = dict(self.config)
+        overrides = self.config.get('worker_overrides', [])
+        if index <= len(overrides):
+            config.update(overrides[index - 1])
+        return config
+    
     def teardown(self):
         """Teardown test environment"""
         try:
@@ -272,6 +373,10 @@ class TestRunner:
     
     def _setup_logging(self):
         """Setup logging configuration"""
+        global _LOG_CONFIGURED
+        if _LOG_CONFIGURED:
+            return
+        
         log_level = self.config.get('log_level', 'INFO')
         log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         
@@ -283,10 +388,12 @@ class TestRunner:
             level=getattr(logging, log_level),
             format=log_format,
             handlers=[
-                logging.FileHandler(f"logs/test_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"),
+                logging.FileHandler(f"logs/test_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log",
+                                    encoding='utf-8', delay=True),
                 logging.StreamHandler()
             ]
         )
+        _LOG_CONFIGURED = True
     
     def run(self, test_files: List[str]) -> bool:
         """Main run method"""
@@ -6,17 +6,37 @@ import json
 import logging
 import os
 from typing import Dict, Any
-import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+# Locator sheet columns, in the order load_from_excel unpacks their positions
+_EXCEL_COLUMNS = ('Name', 'Type', 'Value', 'Description', 'Platform')
+
+
+def _cell_text(row: tuple, index: int, default: str = '') -> str:
+    """Text of the cell at `index`; '' when empty, `default` when the sheet lacks the column (None index)"""
+    if index is None:
+        return default
+    value = row[index] if index < len(row) else None
+    return '' if value is None else str(value)
+
+
 class LocatorManager:
     """Manages element locators from various sources"""
     
     def __init__(self):
         self.locators = {}
         self.platform = 'android'  # default platform
+        # Lookup indexes over self.locators, kept in step by the load/add methods
+        self._flat_index = {}
+        self._by_name_platform = {}
+        self._by_name_any = {}
         
     def load_from_json(self, json_file: str):
         """Load locators from JSON file"""
@@ -25,8 +45,12 @@ class LocatorManager:
                 logger.warning(f"Locator file not found: {json_file}")
                 return False
             
-            with open(json_file, 'r') as f:
-                data = json.load(f)
+            if orjson:
+                with open(json_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(json_file, 'r') as f:
+                    data = json.load(f)
             
             # Support platform-specific locators
             if 'android' in data or 'ios' in data:
@@ -34,6 +58,7 @@ class LocatorManager:
             else:
                 # Assume flat structure
                 self.locators = {'common': data}
+            self._reindex()
             
             logger.info(f"Loaded {len(self._flatten_locators())} locators from {json_file}")
             return True
@@ -43,33 +68,49 @@ class LocatorManager:
             return False
     
     def load_from_excel(self, excel_file: str, sheet_name: str = 'Locators'):
-        """Load locators from Excel file"""
+        """Load locators from an Excel (.xlsx/.xlsm) file"""
+        # Imported here so JSON-only runs never pay for the Excel reader
+        import openpyxl
+        
         try:
             if not os.path.exists(excel_file):
                 logger.warning(f"Excel file not found: {excel_file}")
                 return False
             
-            df = pd.read_excel(excel_file, sheet_name=sheet_name)
-            df = df.fillna('')
+            if excel_file.lower().endswith('.xls'):
+                logger.error(f"Legacy .xls locator files are not supported, save {excel_file} as .xlsx")
+                return False
             
-            for _, row in df.iterrows():
-                name = str(row.get('Name', '')).strip()
-                if not name:
-                    continue
-                
-                locator = {
-                    'type': str(row.get('Type', 'id')).lower(),
-                    'value': str(row.get('Value', '')),
-                    'description': str(row.get('Description', '')),
-                    'platform': str(row.get('Platform', 'common')).lower()
-                }
+            # Stream the sheet instead of building a full workbook/DataFrame
+            workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+            try:
+                rows = workbook[sheet_name].iter_rows(values_only=True)
+                header = next(rows, ())
+                col_index = {str(column): i for i, column in enumerate(header) if column is not None}
+                # Column positions are resolved once; rows are then plain tuple indexing
+                name_at, type_at, value_at, description_at, platform_at = map(col_index.get, _EXCEL_COLUMNS)
                 
-                # Support platform-specific locators
-                platform = locator['platform']
-                if platform not in self.locators:
-                    self.locators[platform] = {}
-                
-                self.locators[platform][name] = locator
+                for row in rows:
+                    name = _cell_text(row, name_at).strip()
+                    if not name:
+                        continue
+                    
+                    locator = {
+                        'type': _cell_text(row, type_at, 'id').lower(),
+                        'value': _cell_text(row, value_at),
+                        'description': _cell_text(row, description_at),
+                        'platform': _cell_text(row, platform_at, 'common').lower()
+                    }
+                    
+                    # Support platform-specific locators
+                    platform = locator['platform']
+                    if platform not in self.locators:
+                        self.locators[platform] = {}
+                    
+                    self.locators[platform][name] = locator
+            finally:
+                workbook.close()
+            self._reindex()
             
             logger.info(f"Loaded {len(self._flatten_locators())} locators from Excel")
             return True
@@ -82,21 +123,16 @@ class LocatorManager:
         """Get locator by name and platform"""
         platform = platform or self.platform
         
-        # Try platform-specific first
-        if platform in self.locators and name in self.locators[platform]:
-            return self.locators[platform][name]
-        
-        # Try common locators
-        if 'common' in self.locators and name in self.locators['common']:
-            return self.locators['common'][name]
-        
-        # Search all platforms
-        for plat, locs in self.locators.items():
-            if name in locs:
-                return locs[name]
-        
-        logger.warning(f"Locator not found: {name}")
-        return {}
+        # Try platform-specific first, then common, then any platform
+        locator = self._by_name_platform.get((platform, name))
+        if locator is None:
+            locator = self._by_name_platform.get(('common', name))
+        if locator is None:
+            locator = self._by_name_any.get(name)
+        if locator is None:
+            logger.warning(f"Locator not found: {name}")
+            return {}
+        return locator
     
     def set_platform(self, platform: str):
         """Set the current platform"""
@@ -109,12 +145,18 @@ class LocatorManager:
         if platform not in self.locators:
             self.locators[platform] = {}
         
-        self.locators[platform][name] = {
+        locator = {
             'type': locator_type.lower(),
             'value': value,
             'description': description,
             'platform': platform
         }
+        self.locators[platform][name] = locator
+        
+        self._flat_index[f"{platform}.{name}"] = locator
+        self._by_name_platform[(platform, name)] = locator
+        # The any-platform fallback resolves to the first platform (in order) defining the name
+        self._by_name_any[name] = next(locs[name] for locs in self.locators.values() if name in locs)
         
         logger.info(f"Added locator: {name} for platform: {platform}")
     
@@ -131,20 +173,24 @@ class LocatorManager:
             logger.error(f"Error saving locators: {str(e)}")
             return False
     
-    def _flatten_locators(self) -> Dict[str, Dict]:
-        """Flatten nested locator structure for counting"""
-        flat = {}
+    def _reindex(self):
+        """Rebuild the lookup indexes after self.locators was (re)loaded"""
+        self._flat_index = {}
+        self._by_name_platform = {}
+        self._by_name_any = {}
         for platform, locs in self.locators.items():
             for name, loc in locs.items():
-                flat[f"{platform}.{name}"] = loc
-        return flat
+                self._flat_index[f"{platform}.{name}"] = loc
+                self._by_name_platform[(platform, name)] = loc
+                self._by_name_any.setdefault(name, loc)
+    
+    def _flatten_locators(self) -> Dict[str, Dict]:
+        """Flattened view of the nested locator structure ('platform.name' keys)"""
+        return self._flat_index
     
     def get_all_locator_names(self) -> list:
         """Get all available locator names"""
-        names = []
-        for platform, locs in self.locators.items():
-            names.extend(locs.keys())
-        return list(set(names))
+        return list(self._by_name_any)
     
     def validate_locators(self) -> tuple:
         """Validate all locators"""
@@ -3,12 +3,23 @@ Helper utilities for TestZen framework
 """
 
 import os
+import threading
 import time
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Passthrough keeps datetimes going through default=str, matching the stdlib output
+_ORJSON_DUMP_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+)
+
 
 def ensure_directory_exists(directory_path):
     """Create directory if it doesn't exist"""
@@ -101,7 +112,10 @@ def load_json_safely(file_path):
     """Load JSON file safely with error handling"""
     import json
     try:
-        with open(file_path, 'r') as f:
+        if orjson:
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
         logger.error(f"JSON file not found: {file_path}")
@@ -123,8 +137,23 @@ def save_json_safely(data, file_path):
         if directory:
             ensure_directory_exists(directory)
         
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        # Write to a temp file and swap it in so readers never see a partial file;
+        # the name is per thread since parallel runners may save the same file
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            # Both writers emit UTF-8 text with non-ASCII characters unescaped
+            if orjson:
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(data, default=str, option=_ORJSON_DUMP_OPTIONS))
+            else:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, default=str, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
+        except Exception:
+            # Don't leave a partial temp file behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
         return True
     except Exception as e:
         logger.error(f"Error saving JSON to {file_path}: {e}")
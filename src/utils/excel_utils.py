@@ -82,51 +82,70 @@ class ExcelManager:
 
     def update_step_status(self, step_index, status, result_message=""):
         """Update step status in Excel"""
+        self.apply_status_batch([(step_index, status, result_message)])
+
+    def apply_status_batch(self, updates):
+        """Write many (step_index, status, result_message) updates with one workbook load and save"""
+        if not updates:
+            return
+
         try:
             wb = openpyxl.load_workbook(self.excel_file)
             ws = wb.active
 
-            # Column order: S.No | Description | Action | Locator Type | Locator Value | Locator Value 2 | Locator Value 3 | Input Data | Status | Result Message
-            status_col = 9  # Column I (Status)
-            result_col = 10  # Column J (Result Message)
-            
-            # Update status (step_index + 2 because of header row and 0-based index)
-            row_num = step_index + 2
-            ws.cell(row=row_num, column=status_col, value=status)
-            
-            # Color coding with professional Excel-standard colors
-            status_cell = ws.cell(row=row_num, column=status_col)
-            if status == "PASSED":
-                # Professional green background for passed tests (similar to Excel conditional formatting)
-                status_cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                status_cell.font = Font(bold=True, color="006100")  # Dark green bold text
-            elif status == "FAILED":
-                # Professional red background for failed tests (similar to Excel conditional formatting)
-                status_cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-                status_cell.font = Font(bold=True, color="9C0006")  # Dark red bold text
-            elif status == "SKIP":
-                # Yellow background for skipped tests
-                status_cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                status_cell.font = Font(bold=True, color="9C6500")  # Dark yellow/brown bold text
+            for step_index, status, result_message in updates:
+                self._write_step_status(ws, step_index, status, result_message)
 
-            # Center align status text
-            status_cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Add result message if provided
-            if result_message:
-                ws.cell(row=row_num, column=result_col, value=result_message)
-            
             wb.save(self.excel_file)
-            
+
         except Exception as e:
             print(f"[TZ] Error updating Excel status: {e}")
-            
+
         # Also update dataframe if available
+        for step_index, status, result_message in updates:
+            self._update_df_status(step_index, status, result_message)
+
+    def _write_step_status(self, ws, step_index, status, result_message):
+        """Write one step's status cell (with colour) and result message"""
+        # Column order: S.No | Description | Action | Locator Type | Locator Value | Locator Value 2 | Locator Value 3 | Input Data | Status | Result Message
+        status_col = 9  # Column I (Status)
+        result_col = 10  # Column J (Result Message)
+        
+        # Update status (step_index + 2 because of header row and 0-based index)
+        row_num = step_index + 2
+        ws.cell(row=row_num, column=status_col, value=status)
+        
+        # Color coding with professional Excel-standard colors
+        status_cell = ws.cell(row=row_num, column=status_col)
+        if status == "PASSED":
+            # Professional green background for passed tests (similar to Excel conditional formatting)
+            status_cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+            status_cell.font = Font(bold=True, color="006100")  # Dark green bold text
+        elif status == "FAILED":
+            # Professional red background for failed tests (similar to Excel conditional formatting)
+            status_cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+            status_cell.font = Font(bold=True, color="9C0006")  # Dark red bold text
+        elif status == "SKIP":
+            # Yellow background for skipped tests
+            status_cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
+            status_cell.font = Font(bold=True, color="9C6500")  # Dark yellow/brown bold text
+
+        # Center align status text
+        status_cell.alignment = Alignment(horizontal='center', vertical='center')
+        
+        # Add result message if provided
+        if result_message:
+            ws.cell(row=row_num, column=result_col, value=result_message)
+
+    def _update_df_status(self, step_index, status, result_message):
+        """Mirror a step's status into the loaded dataframe"""
         if self.df is not None and step_index < len(self.df):
-            if 'Status' not in self.df.columns:
-                self.df['Status'] = ''
-            if 'Result' not in self.df.columns:
-                self.df['Result'] = ''
+            for column in ('Status', 'Result'):
+                if column not in self.df.columns:
+                    self.df[column] = ''
+                elif self.df[column].dtype != object:
+                    # An all-empty column is read as float NaN and rejects text
+                    self.df[column] = self.df[column].astype(object)
             self.df.at[step_index, 'Status'] = status
             self.df.at[step_index, 'Result'] = result_message
 